@@ -0,0 +1,147 @@
+"""
+Benchmark of target game dictionary lookups
+Usage: python bench_target_game.py [--dictionary path] [--grids N]
+"""
+import argparse
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+import target_game
+
+# prints seconds spent by a fresh process to get ready for the first grid
+STARTUP_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import target_game
+{}
+print(time.perf_counter() - start)
+"""
+LOADERS = {
+    'read word list': "open(sys.argv[1]).read().lower().split('\\n')",
+    'index': 'target_game.load_index(sys.argv[1])',
+}
+
+# english letters frequencies, so random grids have words to find
+FREQUENCIES = [8.2, 1.5, 2.8, 4.3, 12.7, 2.2, 2.0, 6.1, 7.0, 0.2, 0.8, 4.0,
+               2.4, 6.7, 7.5, 1.9, 0.1, 6.0, 6.3, 9.1, 2.8, 1.0, 2.4, 0.2,
+               2.0, 0.1]
+
+
+def make_dictionary(path: str, words: int, rng: random.Random):
+    """
+    Writes dictionary of random words to path
+    """
+    with open(path, 'w') as file:
+        for _ in range(words):
+            file.write(''.join(rng.choices(string.ascii_lowercase,
+                                           FREQUENCIES,
+                                           k=rng.randint(2, 9))) + '\n')
+
+
+def make_grid(rng: random.Random) -> List[str]:
+    """
+    Returns letters of random grid
+    """
+    return rng.choices(string.ascii_lowercase, FREQUENCIES, k=9)
+
+
+def get_words_by_scan(filename: str, letters: List[str]) -> List[str]:
+    """
+    Reads the whole dictionary and checks every word,
+    like get_words did before the index
+    """
+    words = []
+    with open(filename, 'r') as file:
+        for word in file.read().split('\n'):
+            word = word.lower()
+            if target_game.is_eligible(word, letters):
+                words.append(word)
+    return list(set(words))
+
+
+def grids_per_second(get_words, filename: str, grids: List[List[str]]):
+    """
+    Returns grids answered per second and answers
+    """
+    start = time.perf_counter()
+    answers = [sorted(get_words(filename, letters)) for letters in grids]
+    return len(grids) / (time.perf_counter() - start), answers
+
+
+def bench_grids(filename: str, grids: int, rng: random.Random):
+    """
+    Compares scanning the dictionary with the index lookup
+    """
+    letters = [make_grid(rng) for _ in range(grids)]
+    target_game.load_index(filename)  # index is compiled once
+    indexed, answers = grids_per_second(target_game.get_words, filename,
+                                        letters)
+    scan_grids = letters[:max(1, grids // 100)]
+    scanned, expected = grids_per_second(get_words_by_scan, filename,
+                                         scan_grids)
+    assert answers[:len(scan_grids)] == expected
+    print(f'  scan             {scanned:10.1f} grids/s')
+    print(f'  index            {indexed:10.1f} grids/s '
+          f'x{indexed / scanned:.1f}')
+
+
+def startup_time(loader: str, filename: str) -> float:
+    """
+    Returns seconds spent by a new process to load the dictionary
+    """
+    output = subprocess.run(
+        [sys.executable, '-c', STARTUP_SCRIPT.format(LOADERS[loader]),
+         filename], cwd=os.path.dirname(os.path.abspath(__file__)),
+        check=True, capture_output=True, text=True).stdout
+    return float(output)
+
+
+def bench_startup(filename: str, repeat: int = 5):
+    """
+    Compares startup with the word list, the index compiled from scratch
+    and the already compiled index
+    """
+    index_path = filename + target_game.INDEX_SUFFIX
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    compiled = startup_time('index', filename)
+    times = {loader: min(startup_time(loader, filename)
+                         for _ in range(repeat)) for loader in LOADERS}
+    print(f'  read word list   {times["read word list"] * 1000:10.1f} ms')
+    print(f'  compile index    {compiled * 1000:10.1f} ms')
+    print(f'  compiled index   {times["index"] * 1000:10.1f} ms')
+
+
+def main():
+    """
+    Runs benchmarks on given or generated dictionary
+    """
+    parser = argparse.ArgumentParser(description='Benchmark target game')
+    parser.add_argument('--dictionary', type=str, default=None,
+                        help='dictionary file, random words by default, '
+                             'its index is written next to it')
+    parser.add_argument('--words', type=int, default=200000,
+                        help='number of words in random dictionary')
+    parser.add_argument('--grids', type=int, default=1000,
+                        help='number of random grids')
+    args = parser.parse_args()
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        filename = args.dictionary
+        if filename is None:
+            filename = os.path.join(directory, 'words.txt')
+            make_dictionary(filename, args.words, rng)
+        print(f'{filename}, startup')
+        bench_startup(filename)
+        print(f'{filename}, {args.grids} grids')
+        bench_grids(filename, args.grids, rng)
+
+
+if __name__ == '__main__':
+    main()
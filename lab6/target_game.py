@@ -1,10 +1,22 @@
 """
 Target game implementation
 """
-from typing import List
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Tuple
+import mmap
+import os
 import random
+import struct
 import sys
 
+MIN_WORD_LENGTH = 4
+INDEX_SUFFIX = '.index'
+INDEX_MAGIC = b'TGINDEX1'
+# magic, dictionary mtime and size, words count, chars count
+INDEX_HEADER = struct.Struct('=8sQQQQ')
+
 
 def get_random_char():
     """
@@ -21,17 +33,146 @@ def generate_grid() -> List[List[str]]:
     return [[get_random_char() for j in range(3)] for i in range(3)]
 
 
+def get_char_mask(chars) -> int:
+    """
+    Returns 64-bit mask of chars
+    Different chars can share a bit, so mask only filters out words
+    >>> get_char_mask('abca') == get_char_mask('cab')
+    True
+    """
+    mask = 0
+    for char in chars:
+        mask |= 1 << (ord(char) % 64)
+    return mask
+
+
+def compile_index(filename: str, mtime_ns: int, size: int) -> bytes:
+    """
+    Reads the dictionary and returns its compiled index:
+    header, char masks of unique lowercase words long enough for the game,
+    offsets of words in string table, buckets of indices of words
+    that contain each char and the string table itself
+    """
+    with open(filename, 'r') as file:
+        words = sorted(set(word for word in file.read().lower().split('\n')
+                           if len(word) >= MIN_WORD_LENGTH))
+    masks = array('Q', map(get_char_mask, words))
+    encoded = [word.encode('utf-8') for word in words]
+    offsets = array('Q', [0])
+    for word in encoded:
+        offsets.append(offsets[-1] + len(word))
+    buckets = dict()
+    for idx, word in enumerate(words):
+        for char in set(word):
+            buckets.setdefault(char, array('I')).append(idx)
+    # (char code, start, length) of every bucket in indices
+    entries = array('Q')
+    indices = array('I')
+    for char in sorted(buckets):
+        entries.extend((ord(char), len(indices), len(buckets[char])))
+        indices.extend(buckets[char])
+    return b''.join([
+        INDEX_HEADER.pack(INDEX_MAGIC, mtime_ns, size, len(words),
+                          len(buckets)),
+        masks.tobytes(), offsets.tobytes(), entries.tobytes(),
+        indices.tobytes(), b''.join(encoded)])
+
+
+def parse_index(data) -> Tuple[memoryview, memoryview, memoryview,
+                               Dict[str, memoryview]]:
+    """
+    Returns string table, word offsets, word masks and buckets
+    of compiled index, arrays are views of data without copying
+    """
+    view = memoryview(data)
+    _, _, _, words_count, chars_count = INDEX_HEADER.unpack_from(view)
+    position = INDEX_HEADER.size
+    sections = []
+    for item_size, count in [(8, words_count), (8, words_count + 1),
+                             (8, 3 * chars_count)]:
+        sections.append(view[position:position + item_size * count]
+                        .cast('Q'))
+        position += item_size * count
+    masks, offsets, entries = sections
+    indices_count = sum(entries[2::3])
+    indices = view[position:position + 4 * indices_count].cast('I')
+    table = view[position + 4 * indices_count:]
+    buckets = {chr(entries[idx]):
+               indices[entries[idx + 1]:entries[idx + 1] + entries[idx + 2]]
+               for idx in range(0, len(entries), 3)}
+    return table, offsets, masks, buckets
+
+
+def read_index_file(path: str, mtime_ns: int, size: int):
+    """
+    Returns memory-mapped compiled index from path
+    or None if it is missing or was compiled from another dictionary version
+    """
+    try:
+        with open(path, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None  # missing or empty file
+    try:
+        header = INDEX_HEADER.unpack_from(data)
+    except struct.error:
+        header = None
+    if header is None or header[:3] != (INDEX_MAGIC, mtime_ns, size):
+        data.close()
+        return None
+    return parse_index(data)
+
+
+@lru_cache(maxsize=16)
+def open_index(filename: str, mtime_ns: int, size: int):
+    """
+    Returns index of dictionary version with specified mtime and size
+    Compiled index is stored next to the dictionary and memory-mapped,
+    so processes share it through the page cache
+    """
+    index_path = filename + INDEX_SUFFIX
+    index = read_index_file(index_path, mtime_ns, size)
+    if index is not None:
+        return index
+
+    data = compile_index(filename, mtime_ns, size)
+    tmp_path = f'{index_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as file:
+            file.write(data)
+        os.replace(tmp_path, index_path)  # readers never see partial index
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)  # clean up
+        return parse_index(data)  # index is used from memory
+    return read_index_file(index_path, mtime_ns, size) or parse_index(data)
+
+
+def load_index(filename: str):
+    """
+    Returns index of the dictionary, it's compiled again
+    if the dictionary file was changed
+    """
+    stat = os.stat(filename)
+    return open_index(filename, stat.st_mtime_ns, stat.st_size)
+
+
 def get_words(filename: str, letters: List[str]) -> List[str]:
     """
     Reads the file f. Checks the words with rules and returns a list of words.
+    Only words that contain the central letter and have no chars
+    outside of letters are checked
     """
+    table, offsets, masks, buckets = load_index(filename)
+    letters_mask = get_char_mask(letters)
+    letters_count = Counter(letters)
     words = []
-    with open(filename, 'r') as file:
-        for word in file.read().split('\n'):
-            word = word.lower()
-            if is_eligible(word, letters):
+    for idx in buckets.get(letters[4], ()):
+        if masks[idx] | letters_mask == letters_mask:
+            word = str(table[offsets[idx]:offsets[idx + 1]], 'utf-8')
+            if is_subset(word, letters_count):
                 words.append(word)
-    return list(set(words))
+    return words
 
 
 def get_user_words() -> List[str]:
@@ -42,14 +183,24 @@ def get_user_words() -> List[str]:
     return [line for line in sys.stdin]
 
 
+def is_subset(word: str, letters_count: Counter) -> bool:
+    """
+    Check if every char occurs in word no more times than in letters
+    >>> is_subset('mama', Counter('mamb'))
+    False
+    """
+    return all(count <= letters_count[char]
+               for char, count in Counter(word).items())
+
+
 def is_eligible(word: str, letters: List[str]) -> bool:
     """
     Check if word can be created from letters
+    >>> is_eligible('mama', list('amxxmyyza'))
+    True
     """
-    for char in word:
-        if word.count(char) > letters.count(char):
-            return False
-    return len(word) >= 4 and letters[4] in word
+    return len(word) >= MIN_WORD_LENGTH and letters[4] in word and \
+        is_subset(word, Counter(letters))
 
 
 def get_pure_user_words(user_words: List[str], letters: List[str],
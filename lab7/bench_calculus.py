@@ -0,0 +1,232 @@
+"""
+Benchmarks of calculus module.
+Usage: python bench_calculus.py [-b benchmark] [--size size]
+"""
+import argparse
+import math
+import time
+
+import calculus
+
+EXPRESSION = 'x ** 3 - 2 * x ** 2 + x'
+# functions with known derivatives and points to differentiate them in
+DERIVATIVES = {
+    'x ** 3': (lambda x: x ** 3, lambda x: 3 * x ** 2, [-3, 0.5, 10]),
+    'sin(x)': (math.sin, math.cos, [0, 1, 100, 1e4, 1e6]),
+    'exp(x)': (math.exp, math.exp, [-5, 0, 5, 50]),
+    'log(x)': (math.log, lambda x: 1 / x, [1e-6, 1e-3, 1, 1000]),
+    'sqrt(x)': (math.sqrt, lambda x: 0.5 / math.sqrt(x), [1e-8, 1e-4, 1, 1e6]),
+    '1 / x': (lambda x: 1 / x, lambda x: -1 / x ** 2, [1e-3, 0.1, 2, 1e5]),
+}
+FIXED_STEP = 1e-10
+# iterations of expensive function
+WORK = 200
+# sequences with known limits
+LIMITS = {
+    '(n ** 2 + n) / n ** 2': 1.0,
+    '(1 + 1 / n) ** n': math.e,
+    '(1 - 1 / n) ** n': 1 / math.e,
+    'n * math.sin(1 / n)': 1.0,
+    '(3 * n + 1) / (n + 2)': 3.0,
+    'math.sqrt(n ** 2 + n) - n': 0.5,
+}
+
+
+def timed(function, *args):
+    """
+    (function, ...) -> (number, object)
+
+    Return seconds spent by function call and its result.
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def eval_max(f, points):
+    """
+    (str, list(number)) -> (number)
+
+    Find maximal value evaluating the expression in every point,
+    the way find_max_1 did before expressions were compiled.
+    """
+    return max(map(lambda x: eval(f), points))
+
+
+def bench_compile(size):
+    """
+    (int) -> (None)
+
+    Compare per-point eval with compiled expression in find_max_1.
+    """
+    points = [k / size for k in range(-size, size)]
+    naive, expected = timed(eval_max, EXPRESSION, points)
+    compiled, result = timed(calculus.find_max_1, EXPRESSION, points)
+    assert result == expected
+    print(f'find_max_1, {len(points)} points')
+    print(f'  per-point eval  {naive:8.3f} s')
+    print(f'  compiled        {compiled:8.3f} s  x{naive / compiled:.1f}')
+
+
+def forward_difference(f, x):
+    """
+    (function, number) -> (number)
+
+    Derivative by forward difference with fixed tiny step.
+    """
+    return (f(x + FIXED_STEP) - f(x)) / FIXED_STEP
+
+
+def relative_error(value, exact):
+    """
+    (number, number) -> (number)
+
+    Error of value relative to exact, absolute error for zero.
+    """
+    return abs(value - exact) / abs(exact) if exact else abs(value)
+
+
+def bench_derivatives(size):
+    """
+    (int) -> (None)
+
+    Compare accuracy of compute_derivatives with fixed step forward
+    difference and measure its evaluations per second.
+    """
+    print('derivatives, max relative error')
+    print(f'  {"function":10} {"fixed step":>12} {"richardson":>12}')
+    for name, (f, derivative, points) in DERIVATIVES.items():
+        exact = [derivative(x) for x in points]
+        fixed = [forward_difference(f, x) for x in points]
+        computed = calculus.compute_derivatives(f, points)
+        errors = [max(map(relative_error, values, exact))
+                  for values in (fixed, computed)]
+        print(f'  {name:10} {errors[0]:12.1e} {errors[1]:12.1e}')
+    points = [k / size for k in range(1, size + 1)]
+    evaluations = 0
+
+    def counted(x):
+        nonlocal evaluations
+        evaluations += 1
+        return math.sin(x)
+
+    seconds, _ = timed(calculus.compute_derivatives, counted, points)
+    print(f'derivatives, {size} points, '
+          f'{evaluations / size:.1f} evaluations per point')
+    print(f'  {size / seconds:10.0f} derivatives/s, '
+          f'{evaluations / seconds:10.0f} evaluations/s')
+
+
+def naive_limit(seq, max_evaluations):
+    """
+    (function, int) -> (number, int)
+
+    Evaluate sequence at n = 1, 2, 3, ... until successive values agree.
+    Return the last value and the number of evaluations.
+    """
+    previous = seq(1)
+    for n in range(2, max_evaluations + 1):
+        value = seq(n)
+        if abs(value - previous) <= calculus.LIMIT_TOLERANCE:
+            return value, n
+        previous = value
+    return previous, max_evaluations
+
+
+def bench_limits(size):
+    """
+    (int) -> (None)
+
+    Compare estimate_limit with naive loop of at most 10 * size
+    evaluations on sequences with known limits.
+    """
+    print('limits, error and evaluations')
+    print(f'  {"sequence":28} {"naive":>20} {"accelerated":>20}')
+    naive_time = accelerated_time = 0
+    for expression, exact in LIMITS.items():
+        seq = calculus.as_function(expression, 'n')
+        seconds, (naive, naive_count) = timed(naive_limit, seq, 10 * size)
+        naive_time += seconds
+        seconds, (limit, _, count) = timed(calculus.estimate_limit, seq)
+        accelerated_time += seconds
+        print(f'  {expression:28} {abs(naive - exact):10.1e} {naive_count:9}'
+              f' {abs(limit - exact):10.1e} {count:9}')
+    print(f'  total time {naive_time:25.3f} s {accelerated_time:18.3f} s')
+
+
+def expensive(x):
+    """
+    (number) -> (number)
+
+    Slow function, 1 - (x - 1) ** 2 computed WORK times over.
+    """
+    total = 0.0
+    for _ in range(WORK):
+        total += (x - 1) ** 2
+    return 1 - total / WORK
+
+
+def workflow(f, points):
+    """
+    (function, list(number)) -> (None)
+
+    Typical analysis of f, functions evaluate it at overlapping points.
+    """
+    max_points = calculus.find_max_2(f, points)
+    calculus.compute_derivative(f, max_points)
+    calculus.get_tangent(f, max_points[0])
+    calculus.get_roots(f, points[0], points[-1], len(points) - 1)
+
+
+def bench_cache(size):
+    """
+    (int) -> (None)
+
+    Compare two runs of workflow on expensive function without cache
+    and with cache.
+    """
+    points = [-1 + 4 * idx / size for idx in range(size + 1)]
+    evaluations = 0
+
+    def counted(x):
+        nonlocal evaluations
+        evaluations += 1
+        return expensive(x)
+
+    print(f'cache, two workflow runs on {size + 1} points')
+    for name in ('no cache', 'cache'):
+        if name == 'cache':
+            # working set must fit, LRU evicts points before their reuse
+            calculus.enable_cache(2 * len(points))
+        evaluations = 0
+        seconds = sum(timed(workflow, counted, points)[0] for _ in range(2))
+        print(f'  {name:10} {seconds:8.3f} s {evaluations:9} evaluations')
+    print(f'  {calculus.cache_info()}')
+    calculus.disable_cache()
+
+
+BENCHMARKS = {
+    'compile': bench_compile,
+    'derivatives': bench_derivatives,
+    'limits': bench_limits,
+    'cache': bench_cache,
+}
+
+
+def main():
+    """
+    Run selected benchmarks.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark calculus module')
+    parser.add_argument('-b', '--benchmark', action='append',
+                        choices=BENCHMARKS, dest='benchmarks',
+                        help='benchmark to run, repeatable, all by default')
+    parser.add_argument('--size', type=int, default=100000,
+                        help='problem size, number of points by default')
+    args = parser.parse_args()
+    for name in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[name](args.size)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,35 +1,379 @@
-# Complete all of the following functions. Currently they all just
-# 'pass' rather than explicitly return value, which means that they
-# implicitly return None.
+import ast
+import math
+import numbers
+import sys
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 
-def find_max_1(f, points):
+# first step of numerical differentiation, relative to the point if it
+# is closer to zero, but at least MIN_RELATIVE_STEP times the point
+FIRST_STEP = 1 / 16
+MIN_RELATIVE_STEP = sys.float_info.epsilon ** (1 / 3)
+DERIVATIVE_TOLERANCE = 1e-12
+MAX_DERIVATIVE_ROWS = 20
+# significant digits of tangent lines, decimal places of limits
+DIGITS = 10
+ROOT_TOLERANCE = 1e-13
+MAX_ITERATIONS = 400
+LIMIT_TOLERANCE = 1e-13
+MAX_LIMIT_EVALUATIONS = 40
+# terms needed before limit is estimated, and number of steps the
+# estimate must stay the same before it is accepted
+MIN_LIMIT_TERMS = 4
+STABLE_LIMIT_STEPS = 2
+# number of points processed at once by find_max_1 and find_max_2
+CHUNK_SIZE = 65536
+# function values cache, disabled by default, see enable_cache
+EVALUATION_CACHE = None
+CACHE_INFO = {'hits': 0, 'misses': 0, 'maxsize': 0}
+
+
+@lru_cache(maxsize=128)
+def compile_expression(expression, variable='x'):
+    """
+    (str, str) -> (function)
+
+    Compile string expression of one variable into a function.
+    The expression is parsed only once, repeated calls are cached.
+
+    >>> compile_expression('x ** 2 + x')(3)
+    12
+    >>> compile_expression('n + 1', 'n')(1)
+    2
+    """
+    return eval(f'lambda {variable}: ({expression})', globals())
+
+
+@lru_cache(maxsize=128)
+def normalize_expression(expression, variable='x'):
+    """
+    (str, str) -> (str)
+
+    Return normalized form of expression, the same for expressions that
+    differ only in formatting.
+
+    >>> normalize_expression('x**2') == normalize_expression('(x ** 2)')
+    True
+    """
+    return f'{variable}: {ast.dump(ast.parse(expression, mode="eval"))}'
+
+
+def enable_cache(maxsize=100000):
+    """
+    (int) -> (None)
+
+    Enable cache of function values shared by all functions of the module.
+    Functions are identified by object or normalized expression, the least
+    recently used values are evicted when cache has more than maxsize values.
+    """
+    global EVALUATION_CACHE
+    EVALUATION_CACHE = OrderedDict()
+    CACHE_INFO.update(hits=0, misses=0, maxsize=maxsize)
+
+
+def disable_cache():
+    """
+    () -> (None)
+
+    Disable and clear cache of function values.
+    """
+    global EVALUATION_CACHE
+    EVALUATION_CACHE = None
+
+
+def cache_info():
+    """
+    () -> (dict)
+
+    Return hits, misses, current size and maxsize of cache of function values.
+
+    >>> enable_cache(2)
+    >>> evaluate('x ** 2', [1, 2, 1, 3, 1])
+    [1, 4, 1, 9, 1]
+    >>> cache_info()
+    {'hits': 2, 'misses': 3, 'maxsize': 2, 'size': 2}
+    >>> disable_cache()
+    """
+    size = 0 if EVALUATION_CACHE is None else len(EVALUATION_CACHE)
+    return dict(CACHE_INFO, size=size)
+
+
+def cached(function, key):
+    """
+    (function, object) -> (function)
+
+    Return function that looks up values of function identified by key
+    in the cache before evaluating it.
+    """
+    cache = EVALUATION_CACHE
+
+    def cached_function(x):
+        point_key = (key, type(x), x)
+        if point_key in cache:
+            CACHE_INFO['hits'] += 1
+            cache.move_to_end(point_key)
+            return cache[point_key]
+        CACHE_INFO['misses'] += 1
+        value = function(x)
+        cache[point_key] = value
+        if len(cache) > CACHE_INFO['maxsize']:
+            cache.popitem(last=False)
+        return value
+    return cached_function
+
+
+def as_function(f, variable='x'):
+    """
+    (function or str, str) -> (function)
+
+    Return f itself if it is a function, otherwise compile it.
+    If cache is enabled, returned function uses it.
+
+    >>> as_function(abs)(-1)
+    1
+    >>> as_function('- x')(1)
+    -1
+    """
+    if isinstance(f, str):
+        function = compile_expression(f, variable)
+        key = normalize_expression(f, variable)
+    else:
+        function = key = f
+    if EVALUATION_CACHE is None:
+        return function
+    return cached(function, key)
+
+
+def evaluate(f, points, variable='x'):
+    """
+    (function or str, list(number), str) -> (list(number))
+
+    Evaluate function f in all points.
+
+    >>> evaluate('x ** 2', [1, 2, 3])
+    [1, 4, 9]
+    """
+    return list(map(as_function(f, variable), points))
+
+
+def split_chunks(points, size=CHUNK_SIZE):
+    """
+    (iterable(number), int) -> (iterator(list(number)))
+
+    Split points into lists of at most size points.
+
+    >>> list(split_chunks(range(5), 2))
+    [[0, 1], [2, 3], [4]]
+    """
+    points = iter(points)
+    while True:
+        chunk = list(islice(points, size))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+def map_chunks(function, f, points, jobs=1):
+    """
+    (function, function or str, iterable(number), int) -> (iterator)
+
+    Yield function(f, chunk) for every chunk of points in order.
+    If jobs > 1, chunks are processed by a pool of worker processes,
+    then f must be a string or a picklable function.
+    """
+    chunks = split_chunks(points)
+    if jobs <= 1:
+        for chunk in chunks:
+            yield function(f, chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(function, f, chunk))
+            # limit number of chunks held in memory
+            if len(pending) > 2 * jobs:
+                yield pending.popleft().result()
+        while len(pending) > 0:
+            yield pending.popleft().result()
+
+
+def chunk_max(f, points):
     """
     (function or str, list(number)) -> (number)
 
+    Return maximal value of function f in points.
+    """
+    return max(map(as_function(f), points))
+
+
+def chunk_max_points(f, points):
+    """
+    (function or str, list(number)) -> (number, list(number))
+
+    Return maximal value of function f in points and points where it is
+    reached.
+    """
+    values = evaluate(f, points)
+    max_value = max(values)
+    return max_value, [point for point, value in zip(points, values)
+                       if value == max_value]
+
+
+def find_max_1(f, points, jobs=1):
+    """
+    (function or str, iterable(number), int) -> (number)
+
     Find and return maximal value of function f in points.
+    Points are processed by chunks, by jobs processes if jobs > 1.
 
     >>> find_max_1('x ** 2 + x', [1, 2, 3, -1])
     12
     >>> find_max_1(lambda x: x ** 2 + x, [1, 2, 3, -1])
     12
+    >>> find_max_1('- x ** 2', range(-10 ** 5, 10 ** 5), jobs=2)
+    0
     """
-    if isinstance(f, str):
-        return max(map(lambda x: eval(f), points))
-    return max(map(lambda x: f(x), points))
+    return max(map_chunks(chunk_max, f, points, jobs))
 
 
-def find_max_2(f, points):
+def find_max_2(f, points, jobs=1):
     """
-    (function or str, list(number)) -> (number)
+    (function or str, iterable(number), int) -> (list(number))
 
     Find and return list of points where function f has the maximal value.
+    Points are processed by chunks in a single pass, by jobs processes
+    if jobs > 1.
 
     >>> find_max_2('x ** 2 + x', [1, 2, 3, -1])
     [3]
     >>> find_max_2(lambda x: x ** 2 + x, [1, 2, 3, -1])
     [3]
+    >>> find_max_2('x % 3', range(10 ** 5), jobs=2)[-2:]
+    [99995, 99998]
+    """
+    max_value, max_points = None, []
+    for value, chunk_points in map_chunks(chunk_max_points, f, points, jobs):
+        if len(max_points) == 0 or value > max_value:
+            max_value, max_points = value, chunk_points
+        elif value == max_value:
+            max_points.extend(chunk_points)
+    if len(max_points) == 0:
+        raise ValueError('points are empty')
+    return max_points
+
+
+def richardson_estimates(values):
+    """
+    (list(number)) -> (list(number))
+
+    Return diagonal of Richardson extrapolation table of sequence values
+    at n, 2n, 4n, ..., assuming its error is a series in powers of 1 / n.
+
+    >>> richardson_estimates([2.0, 1.5, 1.25])
+    [2.0, 1.0, 1.0]
+    """
+    estimates = []
+    row = []
+    for value in values:
+        new_row = [value]
+        for j, previous in enumerate(row, 1):
+            new_row.append(new_row[-1] +
+                           (new_row[-1] - previous) / (2 ** j - 1))
+        row = new_row
+        estimates.append(row[-1])
+    return estimates
+
+
+def wynn_estimates(values):
+    """
+    (list(number)) -> (list(number))
+
+    Return the latest estimates of even columns of Wynn epsilon table
+    of sequence values. The first column after values is Aitken's delta
+    squared process.
+
+    >>> wynn_estimates([1.0, 0.5, 0.75, 0.625])
+    [0.625, 0.6666666666666666]
+    """
+    estimates = []
+    previous = [0.0] * (len(values) + 1)
+    column = list(values)
+    for j in range(len(values)):
+        if j % 2 == 0:
+            estimates.append(column[-1])
+        new_column = []
+        for k in range(len(column) - 1):
+            difference = column[k + 1] - column[k]
+            if difference == 0:
+                return estimates  # the column has converged
+            new_column.append(previous[k + 1] + 1 / difference)
+        previous, column = column, new_column
+    return estimates
+
+
+def estimate_limit(seq):
+    """
+    (function or str) -> (number, number, int)
+
+    Estimate limit of a convergent sequence. Sequence is evaluated at
+    n = 1, 2, 4, ... and accelerated by Richardson extrapolation and Wynn
+    epsilon algorithm, once there are MIN_LIMIT_TERMS terms, until the
+    estimate stays the same for STABLE_LIMIT_STEPS steps. Leading terms
+    where the sequence is undefined are skipped.
+    Return the limit, its error estimate and the number of evaluations.
+    Raise ValueError if the sequence can't be evaluated.
+
+    >>> estimate_limit('(n ** 2 + n) / n ** 2')
+    (1.0, 0.0, 6)
+    >>> estimate_limit('(n - 1) * (n - 2) / n ** 2')
+    (1.0, 0.0, 6)
+    >>> estimate_limit('1 / (n - 1)')[0] < 1e-13
+    True
     """
-    pass
+    seq = as_function(seq, 'n')
+    values = []
+    best, best_error = None, float('inf')
+    previous, stable = None, 0
+    evaluations = 0
+    while evaluations < MAX_LIMIT_EVALUATIONS:
+        n = 2 ** evaluations
+        evaluations += 1
+        try:
+            values.append(float(seq(n)))
+        except (OverflowError, ZeroDivisionError, ValueError):
+            if len(values) == 0:
+                continue  # schedule starts from the first defined term
+            break
+        if len(values) < MIN_LIMIT_TERMS:
+            continue  # few terms can agree by chance
+        estimate, error = None, float('inf')
+        for estimates in [richardson_estimates(values),
+                          wynn_estimates(values)]:
+            if len(estimates) > 1:
+                change = abs(estimates[-1] - estimates[-2])
+                if change < error:
+                    estimate, error = estimates[-1], change
+        if estimate is None:
+            continue
+        if error < best_error:
+            best, best_error = estimate, error
+        tolerance = LIMIT_TOLERANCE * max(1.0, abs(estimate))
+        if previous is not None and error <= tolerance and \
+                abs(estimate - previous) <= tolerance:
+            stable += 1
+            if stable >= STABLE_LIMIT_STEPS:
+                return estimate, error, evaluations
+        else:
+            stable = 0
+        previous = estimate
+    if len(values) == 0:
+        raise ValueError('sequence is undefined for all evaluated n')
+    if best is None:
+        best = values[-1]
+    return best, best_error, evaluations
 
 
 def compute_limit(seq):
@@ -42,40 +386,281 @@ def compute_limit(seq):
     1.0
     >>> compute_limit(lambda n: (n ** 2 + n) / n ** 2)
     1.0
+    >>> compute_limit('(1 + 1 / n) ** n')
+    2.7182818285
+    >>> compute_limit('(n - 1) / (n - 1) ** 2 + 3')
+    3.0
+    >>> compute_limit('(n ** 2 - 3 * n + 2) / n ** 2')
+    1.0
+    """
+    return round(estimate_limit(seq)[0], DIGITS) + 0.0  # no -0.0
+
+
+def is_number(x):
+    """
+    (object) -> (bool)
+
+    Check if x is a single number rather than a collection of points.
+
+    >>> is_number(2.5), is_number([2.5])
+    (True, False)
+    """
+    return isinstance(x, numbers.Number)
+
+
+def round_significant(x, digits=DIGITS):
+    """
+    (number, int) -> (number)
+
+    Round x to digits significant digits.
+
+    >>> round_significant(4.999999999999), round_significant(1.23456e-15, 3)
+    (5.0, 1.23e-15)
+    """
+    if x == 0 or not math.isfinite(x):
+        return x
+    return round(x, digits - 1 - math.floor(math.log10(abs(x))))
+
+
+def first_step(x):
     """
-    pass
+    (number) -> (number)
+
+    Return the first step of numerical differentiation in the point x,
+    a power of two, so the stencil points are exact. Near zero the step is
+    relative to x, so the stencil doesn't cross zero.
+
+    >>> first_step(1000), first_step(0.001), first_step(0)
+    (0.0625, 6.103515625e-05, 0.0625)
+    """
+    scale = abs(x) if 0 < abs(x) < 1 else 1.0
+    step = max(FIRST_STEP * scale, MIN_RELATIVE_STEP * abs(x))
+    return 2.0 ** math.floor(math.log2(step))
+
+
+def compute_derivatives(f, points):
+    """
+    (function or str, list(number)) -> (list(number))
+
+    Compute derivatives of function f in all points at once.
+    Central differences with steps h, h / 2, h / 4, ... are extrapolated
+    by Richardson table, until its error estimate is within
+    DERIVATIVE_TOLERANCE or starts growing because of round-off.
+    Every row of the table is evaluated in one batch for all points.
+
+    >>> compute_derivatives('x ** 3', [0, 1, -2])
+    [0.0, 3.0, 12.0]
+    >>> derivatives = compute_derivatives(lambda x: 1e-12 * x ** 2, [1])
+    >>> abs(derivatives[0] - 2e-12) < 1e-24
+    True
+    >>> abs(compute_derivative('math.sin(x)', 1e4) - math.cos(1e4)) < 1e-9
+    True
+    >>> abs(compute_derivative('math.sqrt(x)', 1e-4) - 50) < 1e-8
+    True
+    """
+    points = list(points)
+    steps = [first_step(x) for x in points]
+    rows = [[] for _ in points]  # last row of table of every point
+    derivatives = [None] * len(points)
+    errors = [math.inf] * len(points)
+    active = list(range(len(points)))
+    for _ in range(MAX_DERIVATIVE_ROWS):
+        stencil = [points[idx] + k * steps[idx] for idx in active
+                   for k in (-1, 1)]
+        values = evaluate(f, stencil)
+        still_active = []
+        for number, idx in enumerate(active):
+            f_1, f_2 = values[2 * number:2 * number + 2]
+            previous = rows[idx]
+            row = [(f_2 - f_1) / (2 * steps[idx])]
+            for j in range(len(previous)):
+                factor = 4 ** (j + 1) - 1
+                row.append(row[j] + (row[j] - previous[j]) / factor)
+                error = max(abs(row[j + 1] - row[j]),
+                            abs(row[j + 1] - previous[j]))
+                if error <= errors[idx]:
+                    derivatives[idx], errors[idx] = row[j + 1], error
+            rows[idx] = row
+            steps[idx] /= 2
+            # at least two extrapolation steps before trusting the estimate
+            if len(row) < 3 or \
+                    (errors[idx] > DERIVATIVE_TOLERANCE *
+                     abs(derivatives[idx]) and
+                     abs(row[-1] - previous[-1]) < 2 * errors[idx]):
+                still_active.append(idx)
+        active = still_active
+        if len(active) == 0:
+            break
+    return [row[-1] if derivative is None else derivative
+            for row, derivative in zip(rows, derivatives)]
 
 
 def compute_derivative(f, x_0):
     """
-    (function or str, number) -> (number)
+    (function or str, number or list(number)) -> (number or list(number))
 
     Compute and return derivative of function f in the point x_0.
+    If x_0 is a list of points, return list of derivatives.
 
     >>> compute_derivative('x ** 2 + x', 2)
     5.0
     >>> compute_derivative(lambda x: x ** 2 + x, 2)
     5.0
+    >>> compute_derivative('x ** 2 + x', [2, 0])
+    [5.0, 1.0]
     """
-    pass
+    if is_number(x_0):
+        return compute_derivatives(f, [x_0])[0]
+    return compute_derivatives(f, x_0)
+
+
+def format_line(k, b):
+    """
+    (number, number) -> (str)
+
+    Format line k * x + b.
+
+    Coefficients are rounded to DIGITS significant digits.
+
+    >>> format_line(-3.0, 4.0)
+    '- 3.0 * x + 4.0'
+    >>> format_line(4.999999999999999, -0.0)
+    '5.0 * x + 0.0'
+    """
+    k, b = round_significant(k) + 0.0, round_significant(b) + 0.0  # no -0.0
+    slope = f'- {abs(k)}' if k < 0 else f'{k}'
+    shift = f'- {abs(b)}' if b < 0 else f'+ {b}'
+    return f'{slope} * x {shift}'
 
 
 def get_tangent(f, x_0):
     """
-    (function or str, number) -> (str)
+    (function or str, number or list(number)) -> (str or list(str))
 
     Compute and return tangent line to function f in the point x_0.
+    If x_0 is a list of points, return list of tangent lines.
 
     >>> get_tangent('x ** 2 + x', 2)
     '5.0 * x - 4.0'
     >>> get_tangent('- x ** 2 + x', 2)
-    '- 3.0 * x - 4.0'
+    '- 3.0 * x + 4.0'
     >>> get_tangent(lambda x: x ** 2 + x, 2)
     '5.0 * x - 4.0'
     >>> get_tangent(lambda x: - x ** 2 + x, 2)
-    '- 3.0 * x - 4.0'
+    '- 3.0 * x + 4.0'
+    >>> get_tangent('x ** 2 + x', [2, 0])
+    ['5.0 * x - 4.0', '1.0 * x + 0.0']
+    >>> get_tangent(lambda x: - x * x, 0.0), get_tangent('math.exp(x)', 1)
+    ('0.0 * x + 0.0', '2.718281828 * x + 0.0')
     """
-    pass
+    points = [x_0] if is_number(x_0) else list(x_0)
+    slopes = compute_derivatives(f, points)
+    values = evaluate(f, points)
+    lines = []
+    for x, k, value in zip(points, slopes, values):
+        b = value - k * x
+        if abs(b) < 10 ** -DIGITS * max(abs(value), abs(k * x)):
+            b = 0.0  # b is lost in cancellation of its terms
+        lines.append(format_line(k, b))
+    return lines[0] if is_number(x_0) else lines
+
+
+def brent_step(state):
+    """
+    (list) -> (number or None)
+
+    Make a step of Brent's method with state
+    [a, f(a), b, f(b), c, f(c), d, e, widths], where b is the best point,
+    the root is between b and c, d and e are the last two steps and widths
+    are the previous bracket widths. Return the next point, whose value
+    must be put to state[3], or None if b is the root.
+    If the bracket wasn't halved by the last two steps, bisect it.
+    """
+    a, f_a, b, f_b, c, f_c, d, e, widths = state
+    if (f_b > 0) == (f_c > 0):
+        c, f_c = a, f_a
+        d = e = b - a
+    if abs(f_c) < abs(f_b):
+        a, b, c = b, c, b
+        f_a, f_b, f_c = f_b, f_c, f_b
+    tolerance = 2 * sys.float_info.epsilon * abs(b) + \
+        ROOT_TOLERANCE * max(1.0, abs(b)) / 2
+    middle = (c - b) / 2
+    if abs(middle) <= tolerance or f_b == 0:
+        state[:] = a, f_a, b, f_b, c, f_c, d, e, widths
+        return None
+
+    widths.append(abs(c - b))
+    bisect = len(widths) > 2 and widths[-1] > widths[-3] / 2
+    if not bisect and abs(e) >= tolerance and abs(f_a) > abs(f_b):
+        s = f_b / f_a
+        if a == c:  # secant
+            p, q = 2 * middle * s, 1 - s
+        else:  # inverse quadratic interpolation
+            q, r = f_a / f_c, f_b / f_c
+            p = s * (2 * middle * q * (q - r) - (b - a) * (r - 1))
+            q = (q - 1) * (r - 1) * (s - 1)
+        if p > 0:
+            q = -q
+        p = abs(p)
+        if 2 * p < min(3 * middle * q - abs(tolerance * q), abs(e * q)):
+            e, d = d, p / q
+        else:
+            d = e = middle
+    else:
+        d = e = middle
+    a, f_a = b, f_b
+    # step is at least tolerance, so the bracket can be closed
+    b += d if abs(d) > tolerance else math.copysign(tolerance, middle)
+    state[:] = a, f_a, b, f_b, c, f_c, d, e, widths
+    return b
+
+
+def solve_brackets(f, brackets):
+    """
+    (function or str, list((number, number))) -> (list(number))
+
+    Find a root of function f in every bracket (a, b), where f(a) and f(b)
+    have different signs. Brent's method is run for all brackets
+    at once, on every iteration f is evaluated in one batch.
+    Raise ArithmeticError if a bracket doesn't converge.
+
+    >>> roots = solve_brackets('x ** 3 - 8', [(0, 5), (-1, 3)])
+    >>> [abs(root - 2) < 1e-13 for root in roots]
+    [True, True]
+    """
+    brackets = [(float(a), float(b)) for a, b in brackets]
+    values = evaluate(f, [x for bracket in brackets for x in bracket])
+    roots = [None] * len(brackets)
+    states = dict()  # index -> state of brent_step
+    for idx, (a, b) in enumerate(brackets):
+        f_a, f_b = values[2 * idx], values[2 * idx + 1]
+        if f_a == 0:
+            roots[idx] = a
+        elif f_b == 0:
+            roots[idx] = b
+        elif (f_a < 0) == (f_b < 0):
+            raise ValueError(f'f has the same sign at {a} and {b}')
+        else:
+            states[idx] = [a, f_a, b, f_b, a, f_a, b - a, b - a, []]
+
+    for _ in range(MAX_ITERATIONS):
+        points = dict()
+        for idx, state in list(states.items()):
+            point = brent_step(state)
+            if point is None:
+                roots[idx] = state[2]
+                del states[idx]
+            else:
+                points[idx] = point
+        if len(points) == 0:
+            break
+        for idx, value in zip(points, evaluate(f, list(points.values()))):
+            states[idx][3] = value
+    if len(states) > 0:
+        a, _, b = next(iter(states.values()))[:3]
+        raise ArithmeticError(f'root between {a} and {b} did not converge')
+    return roots
 
 
 def get_root(f, a, b):
@@ -83,10 +668,42 @@ def get_root(f, a, b):
     (function or str, number, number) -> (number)
 
     Compute and return root of the function f in the interval (a, b).
+    If a and b are lists of interval ends, return list of roots.
 
     >>> get_root('x', -1, 1)
     0.0
     >>> get_root(lambda x: x, -1, 1)
     0.0
+    >>> [round(root, 12) for root in get_root('x ** 2 - 2', [0, -2], [2, 0])]
+    [1.414213562373, -1.414213562373]
+    >>> abs(get_root('x ** 9', -1, 1.5)) < 1e-13
+    True
+    """
+    if is_number(a):
+        return solve_brackets(f, [(a, b)])[0]
+    return solve_brackets(f, zip(a, b))
+
+
+def get_roots(f, a, b, samples=1000):
+    """
+    (function or str, number, number, int) -> (list(number))
+
+    Compute and return all roots of the function f in the interval (a, b).
+    f is sampled in samples + 1 points, and roots are refined in every
+    interval between samples where f changes its sign, so roots where f
+    doesn't cross zero or that are closer than the sampling step may be
+    missed.
+
+    >>> get_roots('x ** 2 - 1', -2, 2)
+    [-1.0, 1.0]
+    >>> get_roots(lambda x: (x - 0.3) * (x - 0.5) * x, 0, 1)
+    [0.3, 0.5]
     """
-    pass
+    points = [a + (b - a) * idx / samples for idx in range(samples + 1)]
+    values = evaluate(f, points)
+    roots = [float(point) for point, value
+             in zip(points[1:-1], values[1:-1]) if value == 0]
+    brackets = [(points[idx], points[idx + 1]) for idx in range(samples)
+                if (values[idx] < 0 < values[idx + 1]) or
+                (values[idx] > 0 > values[idx + 1])]
+    return sorted(roots + solve_brackets(f, brackets))
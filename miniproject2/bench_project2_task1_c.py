@@ -0,0 +1,74 @@
+"""
+Benchmark of caesar encryption: per char shifting vs translation table
+Usage: python bench_project2_task1_c.py [--sizes MB [MB ...]] [--naive-max MB]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import project2_task1_c as caesar
+
+SAMPLE = 'LoReM IpSum dolor sit amet, Та ШоСЬ таМ щось ще!!!!\n'
+OFFSET = 777
+
+
+def shift_data_by_char(text: str, offset: int) -> str:
+    """
+    Shift data with offset char by char, like shift_data used to
+    """
+    return ''.join([caesar.shift_char(char, offset) for char in text])
+
+
+def make_file(path: str, size: int):
+    """
+    Writes about size bytes of mixed latin and cyrillic text to path
+    """
+    block = SAMPLE * (caesar.CHUNK_SIZE // len(SAMPLE.encode()))
+    block_size = len(block.encode())
+    with open(path, 'w', encoding='utf-8') as file:
+        for _ in range(max(1, size // block_size)):
+            file.write(block)
+
+
+def encrypt_file(src: str, dst: str, shift) -> float:
+    """
+    Encrypts src into dst by chunks with shift function,
+    returns seconds spent
+    """
+    start = time.perf_counter()
+    with open(dst, 'w', encoding='utf-8') as file:
+        for chunk in caesar.read_chunks(src):
+            file.write(shift(chunk, OFFSET))
+    return time.perf_counter() - start
+
+
+def main():
+    """
+    Encrypts generated files of given sizes
+    """
+    parser = argparse.ArgumentParser(description='Benchmark caesar cipher')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 100, 1024],
+                        help='file sizes in megabytes')
+    parser.add_argument('--naive-max', type=int, default=100,
+                        help='largest size in megabytes for per char shifting')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        src = os.path.join(directory, 'src.txt')
+        dst = os.path.join(directory, 'dst.txt')
+        for size in args.sizes:
+            make_file(src, size * 1024 * 1024)
+            print(f'{size} MB')
+            translated = encrypt_file(src, dst, caesar.shift_data)
+            print(f'  translation table {size / translated:9.1f} MB/s '
+                  f'({translated:.2f} s)')
+            if size > args.naive_max:
+                print('  per char          skipped, see --naive-max')
+                continue
+            by_char = encrypt_file(src, dst, shift_data_by_char)
+            print(f'  per char          {size / by_char:9.1f} MB/s '
+                  f'({by_char:.2f} s) x{by_char / translated:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark of copying files: throughput and peak memory across file sizes
+Usage: python bench_project2_task2_d.py [--sizes MB [MB ...]]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import project2_task2_d as copying
+
+
+def read_whole_file(src: str, dst: str):
+    """
+    Copy file reading it into memory at once, like copy_file used to
+    """
+    with open(dst, 'wb') as file:
+        with open(src, 'rb') as original_file:
+            file.write(original_file.read())
+
+
+def with_method(method):
+    """
+    Returns copy function of src to dst that uses one of copy methods
+    """
+    def copy(src: str, dst: str):
+        with open(src, 'rb') as original_file, open(dst, 'wb') as file:
+            src_fd, dst_fd = original_file.fileno(), file.fileno()
+            method(src_fd, dst_fd, os.fstat(src_fd).st_size)
+    return copy
+
+
+COPIERS = {
+    'read whole file': read_whole_file,
+    'sendfile': with_method(copying.copy_with_sendfile),
+    'copy_file_range': with_method(copying.copy_with_copy_file_range),
+    'buffer': with_method(copying.copy_with_buffer),
+    'copy_file': copying.copy_file,
+}
+
+
+def make_file(path: str, size: int):
+    """
+    Writes size bytes of random data to path
+    """
+    with open(path, 'wb') as file:
+        for offset in range(0, size, copying.CHUNK_SIZE):
+            file.write(os.urandom(min(copying.CHUNK_SIZE, size - offset)))
+
+
+def measure(copy, src: str, dst: str) -> (float, int):
+    """
+    Returns seconds spent by copy and its peak of traced memory
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        copy(src, dst)
+        return time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    """
+    Runs copy methods on files of given sizes
+    """
+    parser = argparse.ArgumentParser(description='Benchmark file copying')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 16, 256],
+                        help='file sizes in megabytes')
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        src = os.path.join(directory, 'src')
+        dst = os.path.join(directory, 'dst')
+        for size in args.sizes:
+            make_file(src, size * 1024 * 1024)
+            print(f'{size} MB')
+            for name, copy in COPIERS.items():
+                try:
+                    seconds, peak = measure(copy, src, dst)
+                except (AttributeError, OSError) as error:
+                    print(f'  {name:16} unsupported: {error}')
+                    continue
+                print(f'  {name:16} {size / seconds:9.1f} MB/s '
+                      f'peak {peak / 1024:9.1f} KB')
+
+
+if __name__ == '__main__':
+    main()
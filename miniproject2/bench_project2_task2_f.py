@@ -0,0 +1,79 @@
+"""
+Benchmark of searching many patterns: one pass per pattern vs merged regex
+Usage: python bench_project2_task2_f.py [--lines N] [--counts N [N ...]]
+"""
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+import project2_task2_f as grep
+
+
+def random_word(rng: random.Random) -> str:
+    """
+    Returns random lowercase word
+    """
+    return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+
+
+def make_file(path: str, lines: int, rng: random.Random):
+    """
+    Writes lines of random words to path
+    """
+    with open(path, 'w') as file:
+        for _ in range(lines):
+            file.write(' '.join(random_word(rng) for _ in range(8)) + '\n')
+
+
+def search_separately(path: str, patterns: list) -> set:
+    """
+    Returns numbers of lines matched by any pattern, one pass per pattern
+    """
+    matched = set()
+    for pattern in patterns:
+        matched.update(grep.search_lines(path, pattern))
+    return matched
+
+
+def search_merged(path: str, patterns: list) -> set:
+    """
+    Returns numbers of lines matched by any pattern in one pass
+    """
+    return set(grep.search_lines(path, grep.compile_patterns(patterns)))
+
+
+def main():
+    """
+    Searches random words in a generated file
+    """
+    parser = argparse.ArgumentParser(description='Benchmark pattern search')
+    parser.add_argument('--lines', type=int, default=20000,
+                        help='lines in the searched file')
+    parser.add_argument('--counts', type=int, nargs='+',
+                        default=[1, 10, 1000], help='numbers of patterns')
+    args = parser.parse_args()
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'text.txt')
+        make_file(path, args.lines, rng)
+        size = os.path.getsize(path) / 1024 / 1024
+        print(f'{args.lines} lines, {size:.1f} MB')
+        for count in args.counts:
+            patterns = [random_word(rng) for _ in range(count)]
+            start = time.perf_counter()
+            expected = search_separately(path, patterns)
+            separate = time.perf_counter() - start
+            start = time.perf_counter()
+            assert search_merged(path, patterns) == expected
+            merged = time.perf_counter() - start
+            print(f'{count} patterns, {len(expected)} lines matched')
+            print(f'  pass per pattern {separate:8.3f} s')
+            print(f'  merged           {merged:8.3f} s '
+                  f'x{separate / merged:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark of archiving files that match the pattern: time and peak memory
+Usage: python bench_project2_task3_a.py [--size MB] [--jobs N]
+"""
+import argparse
+import os
+import re
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from functools import partial
+from zipfile import ZipFile
+
+import project2_task3_a as archiver
+
+PATTERN = 'needle'
+
+
+def archive_in_memory(src: str, dst: str, pattern: str):
+    """
+    Archive matching files reading and decoding every member at once,
+    like archive used to
+    """
+    with ZipFile(src, 'r') as src_zip, ZipFile(dst, 'w') as zip_file:
+        for info in src_zip.infolist():
+            data = src_zip.read(info.filename)
+            if re.search(pattern, data.decode('utf-8')):
+                zip_file.writestr(info.filename, data)
+
+
+def make_archive(path: str, count: int, size: int):
+    """
+    Writes archive of count text members of about size bytes,
+    every second member contains PATTERN at its end
+    """
+    line = b'lorem ipsum dolor sit amet, consectetur adipiscing elit\n'
+    block = line * (archiver.CHUNK_SIZE // len(line))
+    with ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for index in range(count):
+            with zip_file.open(f'file{index}.txt', 'w') as member:
+                remaining = size
+                while remaining > 0:
+                    remaining -= member.write(block[:remaining])
+                if index % 2 == 0:
+                    member.write(PATTERN.encode())
+
+
+def measure(function, *args) -> (float, int):
+    """
+    Returns seconds spent by function call and its peak of traced memory
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        function(*args)
+        return time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    """
+    Archives matching members of a generated archive
+    """
+    parser = argparse.ArgumentParser(description='Benchmark archiver')
+    parser.add_argument('--size', type=int, default=64,
+                        help='size of large members in megabytes')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(),
+                        help='number of processes of parallel mode')
+    args = parser.parse_args()
+    layouts = {
+        'few large members': (4, args.size * 1024 * 1024),
+        'many small members': (args.size * 256, 4 * 1024),
+    }
+    # memory of worker processes isn't traced
+    archivers = {
+        'in memory': archive_in_memory,
+        'streaming': archiver.archive,
+        f'{args.jobs} jobs': partial(archiver.archive, jobs=args.jobs),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        src = os.path.join(directory, 'src.zip')
+        dst = os.path.join(directory, 'dst.zip')
+        for layout, (count, size) in layouts.items():
+            make_archive(src, count, size)
+            print(f'{layout}: {count} x {size // 1024} KB')
+            for name, function in archivers.items():
+                seconds, peak = measure(function, src, dst, PATTERN)
+                print(f'  {name:12} {seconds:8.3f} s '
+                      f'peak {peak / 1024 / 1024:8.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark of archiving: serial vs parallel compression throughput
+Usage: python bench_project2_task3_c.py [--files N] [--size MB] [--jobs N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from zipfile import ZipFile
+
+import project2_task3_c as archiver
+
+
+def make_tree(path: str, files: int, size: int):
+    """
+    Writes files of size bytes of compressible random text to path
+    """
+    rng = random.Random(0)
+    words = [os.urandom(4).hex() for _ in range(1000)]
+    os.makedirs(path)
+    for index in range(files):
+        with open(os.path.join(path, f'file{index}.txt'), 'w') as file:
+            written = 0
+            while written < size:
+                line = ' '.join(rng.choices(words, k=16)) + '\n'
+                written += file.write(line)
+
+
+def main():
+    """
+    Archives a generated tree with every method, serially and in parallel
+    """
+    parser = argparse.ArgumentParser(description='Benchmark archiver')
+    parser.add_argument('--files', type=int, default=16,
+                        help='number of files')
+    parser.add_argument('--size', type=int, default=8,
+                        help='size of every file in megabytes')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(),
+                        help='number of processes of parallel mode')
+    parser.add_argument('--methods', nargs='+', choices=list(archiver.METHODS),
+                        default=['deflate', 'bzip2', 'lzma'],
+                        help='compression methods')
+    args = parser.parse_args()
+    total = args.files * args.size
+    with tempfile.TemporaryDirectory() as directory:
+        src = os.path.join(directory, 'src')
+        dst = os.path.join(directory, 'dst.zip')
+        make_tree(src, args.files, args.size * 1024 * 1024)
+        print(f'{args.files} files, {total} MB')
+        for method in args.methods:
+            print(method)
+            for jobs in sorted({1, args.jobs}):
+                start = time.perf_counter()
+                archiver.archive(src, dst, jobs, archiver.METHODS[method])
+                seconds = time.perf_counter() - start
+                with ZipFile(dst, 'r') as zip_file:
+                    assert zip_file.testzip() is None
+                print(f'  jobs {jobs:3} {total / seconds:9.1f} MB/s '
+                      f'({seconds:.2f} s)')
+
+
+if __name__ == '__main__':
+    main()
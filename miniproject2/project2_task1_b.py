@@ -2,22 +2,59 @@
 Module for substring replacing
 """
 import argparse
+import glob
+import os
+import re
+import shutil
+import sys
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+CHUNK_SIZE = 1024 * 1024
 
-def get_text_from_file(path: str) -> str:
+
+def read_chunks(path: str) -> Iterator[str]:
     """
-    Get text from file
+    Yields text from file by chunks of at most CHUNK_SIZE chars
     """
     with open(path, 'r', encoding='utf-8') as file:
-        return file.read()
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+            if len(chunk) == 0:
+                break
+            yield chunk
+
+
+def write_chunks_to_file(path: str, chunks: Iterable[str]):
+    """
+    Write text chunks to file
+    Text is written to a temporary file that atomically replaces path
+    at the end, so file is never left partially written
+    """
+    dirname = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=dirname,
+                                     delete=False) as file:
+        try:
+            for chunk in chunks:
+                file.write(chunk)
+            file.close()
+            shutil.copymode(path, file.name)
+            os.replace(file.name, path)
+        except BaseException as e:
+            os.remove(file.name)  # clean up
+            raise e
 
 
-def write_text_to_file(path: str, text: str):
+def print_chunks(chunks: Iterable[str]):
     """
-    Write text from file
+    Print text chunks to stdout as print would print the whole text
     """
-    with open(path, 'w', encoding='utf-8') as file:
-        return file.write(text)
+    for chunk in chunks:
+        sys.stdout.write(chunk)
+    sys.stdout.write('\n')
 
 
 def replace_substring(old: str, new: str, text: str):
@@ -29,28 +66,232 @@ def replace_substring(old: str, new: str, text: str):
     return text.replace(old, new)
 
 
+def replace_chunks(old: str, new: str,
+                   chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Replace old substrings with new in text chunks
+    Last len(old) - 1 chars of a chunk are carried over to the next one,
+    so substrings split between chunks are replaced too
+    >>> ''.join(replace_chunks('ab', '!', ['bba', 'bbba', 'aab']))
+    'bb!bbaa!'
+    >>> ''.join(replace_chunks('aa', '!', ['a', 'a', 'a']))
+    '!a'
+    >>> ''.join(replace_chunks('', '!', ['ab', 'c']))
+    '!a!b!c!'
+    """
+    if len(old) == 0:
+        for chunk in chunks:
+            if len(chunk) > 0:
+                yield new + new.join(chunk)
+        yield new
+        return
+
+    carry = ''
+    for chunk in chunks:
+        text = carry + chunk
+        parts = []
+        position = 0
+        while True:
+            found = text.find(old, position)
+            if found == -1:
+                break
+            parts.append(text[position:found])
+            parts.append(new)
+            position = found + len(old)
+        # tail may be the beginning of substring that ends in next chunk
+        keep = max(position, len(text) - len(old) + 1)
+        parts.append(text[position:keep])
+        carry = text[keep:]
+        yield ''.join(parts)
+    yield carry
+
+
+def read_rules(path: str) -> Dict[str, str]:
+    """
+    Read replacement rules from file
+    Each non-empty line is old and new substrings separated by a tab
+    """
+    rules = dict()
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.rstrip('\r\n')
+            if len(line) == 0:
+                continue
+            old, sep, new = line.partition('\t')
+            if len(sep) == 0 or len(old) == 0:
+                raise ValueError('Invalid rule: ' + line)
+            rules[old] = new
+    return rules
+
+
+def replace_rules_chunks(rules: Dict[str, str], chunks: Iterable[str],
+                         counter: Optional[Counter] = None) -> Iterator[str]:
+    """
+    Replace all old substrings from rules with new ones in one pass
+    If several substrings start at the same position, the longest one
+    is replaced; counter counts replacements by old substring
+    >>> counter = Counter()
+    >>> rules = {'ab': '1', 'abc': '2', 'c': '3'}
+    >>> ''.join(replace_rules_chunks(rules, ['xab', 'cab', 'cc'], counter))
+    'x223'
+    >>> sorted(counter.items())
+    [('abc', 2), ('c', 1)]
+    """
+    if counter is None:
+        counter = Counter()
+    # alternatives are tried in order, so longer ones must go first
+    pattern = re.compile('|'.join(
+        re.escape(old) for old in sorted(rules, key=len, reverse=True)))
+    max_length = max(len(old) for old in rules)
+
+    carry = ''
+    chunks = iter(chunks)
+    chunk = next(chunks, None)
+    while chunk is not None:
+        next_chunk = next(chunks, None)
+        is_last = next_chunk is None
+        text = carry + chunk
+        # match starting from limit may be extended by the next chunk
+        limit = len(text) + 1 if is_last else len(text) - max_length + 1
+        parts = []
+        position = 0
+        while True:
+            found = pattern.search(text, position)
+            if found is None or found.start() >= limit:
+                break
+            parts.append(text[position:found.start()])
+            parts.append(rules[found.group()])
+            counter[found.group()] += 1
+            position = found.end()
+        keep = max(position, min(limit, len(text)))
+        parts.append(text[position:keep])
+        carry = text[keep:]
+        yield ''.join(parts)
+        chunk = next_chunk
+
+
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    """
+    Returns paths matched by glob patterns, without duplicates
+    Pattern without matches is treated as a path
+    """
+    paths = dict()
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern, recursive=True)) or [pattern]:
+            paths[path] = None
+    return list(paths)
+
+
+def replace_in_file(path: str, rules: Dict[str, str],
+                    dry_run: bool = False) -> Tuple[Counter, Optional[str]]:
+    """
+    Replace substrings from rules in file in place
+    If dry_run is True, file is only scanned
+    Returns replacement counts by old substring and error message or None
+    """
+    counter = Counter()
+    try:
+        chunks = replace_rules_chunks(rules, read_chunks(path), counter)
+        if dry_run:
+            for _ in chunks:
+                pass
+        else:
+            write_chunks_to_file(path, chunks)
+    except FileNotFoundError:
+        return counter, "File at the specified path was not found"
+    except IsADirectoryError:
+        return counter, "Please specify path to the file, not a directory"
+    except PermissionError:
+        return counter, "Insufficient permissions to access file"
+    except UnicodeDecodeError:
+        return counter, "Decoding error, maybe specified file is binary"
+    return counter, None
+
+
+def replace_in_files(paths: List[str], rules: Dict[str, str],
+                     dry_run: bool = False, jobs: int = 1) \
+        -> Iterator[Tuple[str, Counter, Optional[str]]]:
+    """
+    Replace substrings from rules in files in place
+    If jobs > 1, files are processed by a pool of worker processes
+    Yields (path, counts, error) in the order of paths
+    """
+    if jobs <= 1:
+        results = map(replace_in_file, paths, repeat(rules), repeat(dry_run))
+        for path, (counter, error) in zip(paths, results):
+            yield path, counter, error
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(replace_in_file, paths, repeat(rules),
+                               repeat(dry_run))
+        for path, (counter, error) in zip(paths, results):
+            yield path, counter, error
+
+
+def batch_main(args: argparse.Namespace):
+    """
+    Replace substrings from rules file in all files specified by args
+    """
+    try:
+        rules = read_rules(args.rules)
+    except FileNotFoundError:
+        print("Rules file was not found")
+        return
+    except ValueError as e:
+        print(e)
+        return
+    if len(rules) == 0:
+        print("Rules file is empty")
+        return
+
+    for path, counter, error in replace_in_files(
+            expand_paths(args.args), rules, args.dry_run, args.jobs):
+        if error is not None:
+            print(f'{path}: {error}')
+            continue
+        print(f'{path}: {sum(counter.values())} replacements')
+        if args.dry_run:
+            for old, count in counter.most_common():
+                print(f'    {old!r} -> {rules[old]!r}: {count}')
+
+
 def main():
     """
     Main function for substring replacing
     Usage: python project2_task1_b.py old_string new_string path [--inplace]
+    or: python project2_task1_b.py --rules RULES path [path ...]\
+    [--dry-run] [--jobs N]
     """
     parser = argparse.ArgumentParser(description='Substring replacing')
-    parser.add_argument('old', type=str, help='substring to be replaced')
-    parser.add_argument('new', type=str, help='substring to be replaced with')
-    parser.add_argument('path', type=str, help='path to file')
+    parser.add_argument('args', nargs='+', metavar='old new path | path',
+                        help='substring to be replaced, substring to be '
+                             'replaced with and path to file, or paths and '
+                             'globs of files if --rules is specified')
     parser.add_argument('--inplace', action='store_true',
                         help='Replace in place')
+    parser.add_argument('--rules', type=str, default=None,
+                        help='File with tab separated old and new substrings '
+                             'per line, files are changed in place')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Only report replacements with --rules')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of parallel processes with --rules')
 
     args = parser.parse_args()
+    if args.rules is not None:
+        batch_main(args)
+        return
+    if len(args.args) != 3:
+        parser.error('old, new and path are required without --rules')
+    args.old, args.new, args.path = args.args
 
     try:
-        text = get_text_from_file(args.path)
-        text = replace_substring(args.old, args.new, text)
-
+        chunks = replace_chunks(args.old, args.new, read_chunks(args.path))
         if args.inplace:
-            write_text_to_file(args.path, text)
+            write_chunks_to_file(args.path, chunks)
         else:
-            print(text)
+            print_chunks(chunks)
     except FileNotFoundError:
         print("File at the specified path was not found")
     except IsADirectoryError:
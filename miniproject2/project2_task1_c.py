@@ -6,11 +6,21 @@ Module for caesar encryption/decryption
 True
 """
 import argparse
+import os
+import shutil
+import sys
+import tempfile
+from functools import lru_cache
+from math import lcm
+from typing import Dict, Iterable, Iterator
 
 alphabets = [
     'абвгґдеєжзиіїйклмнопрстуфхцчшщьюя',
     'abcdefghijklmnopqrstuvwxyz'
 ]
+CHUNK_SIZE = 1024 * 1024
+# shifting by offset and by offset + period gives the same result
+period = lcm(*(len(alphabet) for alphabet in alphabets))
 
 
 def normalize_idx(idx: int, alphabet_len: int):
@@ -47,6 +57,23 @@ def shift_char(char: str, offset: int) -> str:
     return char
 
 
+@lru_cache(maxsize=64)
+def translation_table(offset: int) -> Dict[int, str]:
+    """
+    Returns table for str.translate that shifts chars by offset
+    >>> 'Abz'.translate(translation_table(1))
+    'Bca'
+    >>> 'ШоСЬ!'.translate(translation_table(-4))
+    'ФкНЦ!'
+    """
+    table = dict()
+    for alphabet in alphabets:
+        for char in alphabet:
+            table[ord(char)] = shift_char(char, offset)
+            table[ord(char.upper())] = shift_char(char.upper(), offset)
+    return table
+
+
 def shift_data(text: str, offset: int) -> str:
     """
     Shift data with offset
@@ -57,7 +84,17 @@ def shift_data(text: str, offset: int) -> str:
     >>> shift_data(shift_data('@#$%^&*(llhji', 17), -17)
     '@#$%^&*(llhji'
     """
-    return ''.join([shift_char(char, offset) for char in text])
+    return text.translate(translation_table(offset % period))
+
+
+def shift_chunks(chunks: Iterable[str], offset: int) -> Iterator[str]:
+    """
+    Shift text chunks with offset
+    >>> list(shift_chunks(['abc', 'Z'], 1))
+    ['bcd', 'A']
+    """
+    for chunk in chunks:
+        yield shift_data(chunk, offset)
 
 
 def encrypt(text: str, offset: int) -> str:
@@ -82,20 +119,45 @@ def decrypt(text: str, offset: int) -> str:
     return shift_data(text, -offset)
 
 
-def get_text_from_file(path: str) -> str:
+def read_chunks(path: str) -> Iterator[str]:
     """
-    Get text from file
+    Yields text from file by chunks of at most CHUNK_SIZE chars
     """
     with open(path, 'r', encoding='utf-8') as file:
-        return file.read()
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+            if len(chunk) == 0:
+                break
+            yield chunk
 
 
-def write_text_to_file(path: str, text: str):
+def write_chunks_to_file(path: str, chunks: Iterable[str]):
     """
-    Write text from file
+    Write text chunks to file
+    Text is written to a temporary file that atomically replaces path
+    at the end, so file is never left partially written
     """
-    with open(path, 'w', encoding='utf-8') as file:
-        return file.write(text)
+    dirname = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=dirname,
+                                     delete=False) as file:
+        try:
+            for chunk in chunks:
+                file.write(chunk)
+            file.close()
+            shutil.copymode(path, file.name)
+            os.replace(file.name, path)
+        except BaseException as e:
+            os.remove(file.name)  # clean up
+            raise e
+
+
+def print_chunks(chunks: Iterable[str]):
+    """
+    Print text chunks to stdout as print would print the whole text
+    """
+    for chunk in chunks:
+        sys.stdout.write(chunk)
+    sys.stdout.write('\n')
 
 
 def non_negative_int(arg):
@@ -131,15 +193,12 @@ def main():
     args = parser.parse_args()
 
     try:
-        text = get_text_from_file(args.path)
-        if args.decrypt:
-            text = decrypt(text, args.offset)
-        else:
-            text = encrypt(text, args.offset)
+        offset = -args.offset if args.decrypt else args.offset
+        chunks = shift_chunks(read_chunks(args.path), offset)
         if args.inplace:
-            write_text_to_file(args.path, text)
+            write_chunks_to_file(args.path, chunks)
         else:
-            print(text)
+            print_chunks(chunks)
     except FileNotFoundError:
         print("File at the specified path was not found")
     except IsADirectoryError:
@@ -2,7 +2,14 @@
 Module that produces a depth-indented listing of files
 """
 import argparse
+import heapq
+import json
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, TextIO
+
+BUFFERED_LINES = 4096
 
 
 def get_display_name(path: str) -> str:
@@ -40,68 +47,301 @@ def get_entry_header(prefix: str, will_be_last: bool):
     return prefix + ending
 
 
-def print_styled(path: str):
+def style_name(display_name: str, is_dir: bool, link: Optional[str],
+               color: bool = True) -> str:
     """
-    Prints styled entry name
+    Returns styled entry name
     White - regular files
     Blue - directory
     Green - executable
     Symlink displayed as file1 -> file2
+    >>> style_name('home', True, None)
+    '\\x1b[1;34mhome\\x1b[0m'
+    >>> style_name('a', False, 'b', False)
+    'a -> b'
     """
-    display_name = get_display_name(path)
-    color = ''
     bold = '1'  # True
-    if os.path.isdir(path):
-        color = '34'  # Blue
-    elif os.path.islink(path):
-        display_name += " -> " + os.readlink(path)
-        color = '32'  # Green
+    if is_dir:
+        color_code = '34'  # Blue
+    elif link is not None:
+        display_name += " -> " + link
+        color_code = '32'  # Green
     else:
+        color_code = ''
         bold = '0'
-    print(f"\033[{bold};{color}m{display_name}\033[0m")
+    if not color:
+        return display_name
+    return f"\033[{bold};{color_code}m{display_name}\033[0m"
+
+
+def sorted_entries(path: str) -> List[os.DirEntry]:
+    """
+    Returns directory entries sorted by name
+    Returns empty list if directory can't be listed
+    """
+    try:
+        with os.scandir(path) as entries:
+            return sorted(entries, key=lambda entry: entry.name)
+    except PermissionError:
+        return []  # Insufficient permissions to list this directory
 
 
-def print_tree(path: str, prefix: str = "") -> (int, int):
+def print_tree(path: str, prefix: str = "", max_depth: Optional[int] = None,
+               color: bool = True, out: TextIO = None) -> (int, int):
     """
-    Prints directory contents as a tree
+    Prints directory contents as a tree to out (stdout by default)
+    Entries deeper than max_depth are not listed
     Returns tuple of directories count and files count inside directory
     """
-    directories_count = 0
+    if out is None:
+        out = sys.stdout
+    lines = []
+
+    is_dir = os.path.isdir(path)
+    link = os.readlink(path) if not is_dir and os.path.islink(path) else None
+    lines.append(style_name(get_display_name(path), is_dir, link, color))
+    if not is_dir:
+        out.write(lines[0] + '\n')
+        return 0, 1
+
+    directories_count = 1
     files_count = 0
+    # stack of [entries, index of next entry, prefix, depth of entries]
+    stack = [[sorted_entries(path), 0, prefix, 1]]
+    if max_depth is not None and max_depth < 1:
+        stack.clear()
+    while len(stack) > 0:
+        frame = stack[-1]
+        entries, idx, prefix, depth = frame
+        if idx == len(entries):
+            stack.pop()
+            continue
+        frame[1] += 1
+        entry = entries[idx]
+        will_be_last = idx == len(entries) - 1
 
-    print_styled(path)
+        # DirEntry caches type, so no additional stat calls are made
+        is_dir = entry.is_dir()
+        link = os.readlink(entry.path) \
+            if not is_dir and entry.is_symlink() else None
+        lines.append(get_entry_header(prefix, will_be_last) +
+                     style_name(entry.name, is_dir, link, color))
+        if is_dir:
+            directories_count += 1
+            if max_depth is None or depth < max_depth:
+                stack.append([sorted_entries(entry.path), 0,
+                              get_new_prefix(prefix, will_be_last),
+                              depth + 1])
+        else:
+            files_count += 1
 
-    if os.path.isdir(path):
-        directories_count = 1
-        try:
-            entries = sorted(os.listdir(path), key=lambda x: x)
-            for idx, entry in enumerate(entries):
-                will_be_last = idx == len(entries) - 1
-                new_prefix = get_new_prefix(prefix, will_be_last)
-                print(get_entry_header(prefix, will_be_last), end='')
-                dirs, files = print_tree(os.path.join(path, entry), new_prefix)
-                directories_count += dirs
-                files_count += files
-        except PermissionError:
-            pass  # Insufficient permissions to list this directory
-    else:
-        files_count = 1
+        if len(lines) >= BUFFERED_LINES:
+            out.write('\n'.join(lines) + '\n')
+            lines.clear()
+    if len(lines) > 0:
+        out.write('\n'.join(lines) + '\n')
+    return directories_count, files_count
+
+
+def human_size(size: int) -> str:
+    """
+    Returns human readable size
+    >>> human_size(512)
+    '512 B'
+    >>> human_size(1536)
+    '1.5 KiB'
+    >>> human_size(3 * 1024 ** 3)
+    '3.0 GiB'
+    """
+    for unit in ['B', 'KiB', 'MiB', 'GiB', 'TiB']:
+        if size < 1024 or unit == 'TiB':
+            break
+        size /= 1024
+    return f"{size} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+
+
+def scan_directory(path: str) -> List[dict]:
+    """
+    Returns nodes of directory entries, files have their sizes set
+    Symlinks are not followed
+    Returns empty list if directory can't be listed
+    """
+    nodes = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    nodes.append({'name': entry.name, 'path': entry.path,
+                                  'type': 'directory', 'size': 0,
+                                  'children': []})
+                else:
+                    nodes.append({'name': entry.name, 'path': entry.path,
+                                  'type': 'link' if entry.is_symlink()
+                                  else 'file',
+                                  'size': entry.stat(
+                                      follow_symlinks=False).st_size})
+    except (PermissionError, FileNotFoundError):
+        pass  # Insufficient permissions or directory was removed
+    return nodes
+
+
+def build_du_tree(path: str, jobs: int = 8) -> dict:
+    """
+    Returns tree of nodes with total size of every directory
+    Directories of the same depth are scanned by a pool of threads
+    Children are sorted by size, the largest first
+    """
+    root = {'name': get_display_name(path), 'path': path,
+            'type': 'directory', 'size': 0, 'children': []}
+    directories = [root]  # in breadth-first order
+    level = [root]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while len(level) > 0:
+            next_level = []
+            for node, children in zip(level, executor.map(
+                    scan_directory, [node['path'] for node in level])):
+                node['children'] = children
+                next_level.extend(child for child in children
+                                  if child['type'] == 'directory')
+            directories.extend(next_level)
+            level = next_level
+
+    # children are aggregated before their parents
+    for node in reversed(directories):
+        node['children'].sort(key=lambda child: (-child['size'],
+                                                 child['name']))
+        node['size'] = sum(child['size'] for child in node['children'])
+    return root
+
+
+def prune_du_tree(root: dict, max_depth: int):
+    """
+    Remove nodes deeper than max_depth from tree
+    """
+    level = [root]
+    for _ in range(max_depth):
+        level = [child for node in level for child in node['children']
+                 if child['type'] == 'directory']
+    for node in level:
+        node['children'] = []
+
+
+def heaviest_directories(root: dict, top: int) -> List[dict]:
+    """
+    Returns top directories with the largest size, except root
+    """
+    directories = []
+    stack = [root]
+    while len(stack) > 0:
+        node = stack.pop()
+        for child in node['children']:
+            if child['type'] == 'directory':
+                directories.append(child)
+                stack.append(child)
+    return heapq.nlargest(top, directories, key=lambda node: node['size'])
+
+
+def print_du_tree(root: dict, color: bool = True,
+                  out: TextIO = None) -> (int, int):
+    """
+    Prints tree of nodes with sizes to out (stdout by default)
+    Returns tuple of directories count and files count inside directory
+    """
+    if out is None:
+        out = sys.stdout
+    lines = [style_name(root['name'], True, None, color) +
+             f" [{human_size(root['size'])}]"]
+    directories_count = 1
+    files_count = 0
+    # stack of [nodes, index of next node, prefix]
+    stack = [[root['children'], 0, ""]]
+    while len(stack) > 0:
+        frame = stack[-1]
+        nodes, idx, prefix = frame
+        if idx == len(nodes):
+            stack.pop()
+            continue
+        frame[1] += 1
+        node = nodes[idx]
+        will_be_last = idx == len(nodes) - 1
+
+        is_dir = node['type'] == 'directory'
+        link = os.readlink(node['path']) if node['type'] == 'link' else None
+        lines.append(get_entry_header(prefix, will_be_last) +
+                     style_name(node['name'], is_dir, link, color) +
+                     f" [{human_size(node['size'])}]")
+        if is_dir:
+            directories_count += 1
+            stack.append([node['children'], 0,
+                          get_new_prefix(prefix, will_be_last)])
+        else:
+            files_count += 1
+
+        if len(lines) >= BUFFERED_LINES:
+            out.write('\n'.join(lines) + '\n')
+            lines.clear()
+    out.write('\n'.join(lines) + '\n')
     return directories_count, files_count
 
 
+def du_main(args: argparse.Namespace):
+    """
+    Prints directory contents with sizes, as tree, top list or json
+    """
+    root = build_du_tree(args.path, args.jobs)
+    if args.top is not None:
+        nodes = heaviest_directories(root, args.top)
+        if args.json:
+            json.dump([{'path': node['path'], 'size': node['size']}
+                       for node in nodes], sys.stdout)
+            print()
+        else:
+            for node in nodes:
+                print(f"{human_size(node['size']):>10}  {node['path']}")
+        return
+
+    if args.max_depth is not None:
+        prune_du_tree(root, args.max_depth)
+    if args.json:
+        json.dump(root, sys.stdout)
+        print()
+        return
+    directories_count, files_count = print_du_tree(root, not args.no_color)
+    print(f"{directories_count - 1} directories, {files_count} files, "
+          f"{human_size(root['size'])}")
+
+
 def main():
     """
     Main function
-    Usage: python project2_task2_a.py path
+    Usage: python project2_task2_a.py path [--max-depth N] [--no-color]\
+    [--du] [--top N] [--json] [--jobs N]
     """
     parser = argparse.ArgumentParser(
         description='Prints directory contents as a tree')
     parser.add_argument('path', type=str, help='path to directory')
+    parser.add_argument('--max-depth', type=int, default=None,
+                        help='Max depth of listed entries')
+    parser.add_argument('--no-color', action='store_true',
+                        help='Print entries without colors')
+    parser.add_argument('--du', action='store_true',
+                        help='Show sizes, entries are sorted by size')
+    parser.add_argument('--top', type=int, default=None,
+                        help='Show only N largest directories with --du')
+    parser.add_argument('--json', action='store_true',
+                        help='Print result as json with --du')
+    parser.add_argument('--jobs', type=int, default=8,
+                        help='Number of threads that scan directories '
+                             'with --du')
     args = parser.parse_args()
 
     if os.path.isdir(args.path):
         try:
-            directories_count, files_count = print_tree(args.path)
+            if args.du:
+                du_main(args)
+                return
+            directories_count, files_count = print_tree(
+                args.path, max_depth=args.max_depth, color=not args.no_color)
             print(f"{directories_count - 1} directories, {files_count} files")
         except FileNotFoundError:
             print("\nCannot found some file, maybe lack of permissions.")
@@ -2,16 +2,82 @@
 Module for copying files from src to dst
 """
 import argparse
+import hashlib
+import json
 import os
+import shutil
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, \
+    as_completed, wait
 
+CHUNK_SIZE = 1024 * 1024
+MANIFEST_NAME = '.copy_manifest.json'
 
-def copy_file(src: str, dst: str):
+
+def copy_with_sendfile(src_fd: int, dst_fd: int, size: int):
+    """
+    Copy size bytes with os.sendfile (in-kernel, no user space buffers)
+    """
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+        if sent == 0:
+            break
+        offset += sent
+
+
+def copy_with_copy_file_range(src_fd: int, dst_fd: int, size: int):
+    """
+    Copy size bytes with os.copy_file_range
+    """
+    copied = 0
+    while copied < size:
+        count = os.copy_file_range(src_fd, dst_fd, size - copied)
+        if count == 0:
+            break
+        copied += count
+
+
+def copy_with_buffer(src_fd: int, dst_fd: int, size: int):
+    """
+    Copy file by chunks through one reusable buffer
+    """
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(src_fd, 'rb', buffering=0, closefd=False) as original_file:
+        while True:
+            count = original_file.readinto(buffer)
+            if not count:
+                break
+            written = 0
+            while written < count:
+                written += os.write(dst_fd, view[written:count])
+
+
+def copy_file(src: str, dst: str, preserve: bool = False):
     """
-    Copy file from src to dst
+    Copy file from src to dst using constant amount of memory
+    If preserve is True, permissions and modification times are copied too
     """
-    with open(dst, 'wb') as file:
-        with open(src, 'rb') as original_file:
-            file.write(original_file.read())
+    with open(src, 'rb') as original_file, open(dst, 'wb') as file:
+        src_fd, dst_fd = original_file.fileno(), file.fileno()
+        size = os.fstat(src_fd).st_size
+        # special files may report zero size, copy them through buffer
+        methods = ()
+        if size > 0:
+            methods = (copy_with_sendfile, copy_with_copy_file_range)
+        for method in methods:
+            try:
+                method(src_fd, dst_fd, size)
+                break
+            except (AttributeError, OSError):
+                # method is not supported by platform or file system
+                os.lseek(src_fd, 0, os.SEEK_SET)
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+                os.ftruncate(dst_fd, 0)
+        else:
+            copy_with_buffer(src_fd, dst_fd, size)
+    if preserve:
+        shutil.copystat(src, dst)
 
 
 def get_dest_path(src: str, dst: str, srcpath: str):
@@ -23,33 +89,198 @@ def get_dest_path(src: str, dst: str, srcpath: str):
     return os.path.normpath(os.path.join(dst, os.path.relpath(srcpath, src)))
 
 
-def copy_tree(src: str, dst: str):
+def all_files(src: str, dst: str):
     """
-    Copy files from src to dst
+    Yields (src_path, dest_path) of all files in src
+    Destination directory is created before its files are yielded
     """
     for subdir, dirs, files in os.walk(src):
         os.makedirs(get_dest_path(src, dst, subdir), exist_ok=True)
         for file in files:
             src_path = os.path.join(subdir, file)
-            dest_path = get_dest_path(src, dst, src_path)
-            copy_file(src_path, dest_path)
+            yield src_path, get_dest_path(src, dst, src_path)
+
+
+def copy_files(files, jobs: int = 1, preserve: bool = False):
+    """
+    Copy all (src_path, dest_path) pairs
+    If jobs > 1, files are copied by a pool of worker processes
+    """
+    if jobs <= 1:
+        for src_path, dest_path in files:
+            copy_file(src_path, dest_path, preserve)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = set()
+        try:
+            for src_path, dest_path in files:
+                pending.add(executor.submit(copy_file, src_path, dest_path,
+                                            preserve))
+                # limit number of submitted copies, check finished ones
+                if len(pending) >= 2 * jobs:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()  # re-raise errors from workers
+            for future in as_completed(pending):
+                future.result()
+        finally:
+            for future in pending:
+                future.cancel()  # don't start copies after an error
+
+
+def copy_tree(src: str, dst: str, jobs: int = 1, preserve: bool = False):
+    """
+    Copy files from src to dst
+    If jobs > 1, files are copied by a pool of worker processes
+    """
+    copy_files(all_files(src, dst), jobs, preserve)
+
+
+def get_file_hash(path: str) -> str:
+    """
+    Returns sha256 hex digest of file content
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray(CHUNK_SIZE)
+    with open(path, 'rb', buffering=0) as file:
+        while True:
+            count = file.readinto(buffer)
+            if not count:
+                break
+            digest.update(memoryview(buffer)[:count])
+    return digest.hexdigest()
+
+
+def load_manifest(dst: str) -> dict:
+    """
+    Load manifest with content hashes of files in dst
+    Returns empty manifest if it does not exist or is broken
+    """
+    try:
+        with open(os.path.join(dst, MANIFEST_NAME), 'r') as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return dict()
+
+
+def save_manifest(dst: str, manifest: dict):
+    """
+    Save manifest with content hashes of files in dst
+    """
+    with open(os.path.join(dst, MANIFEST_NAME), 'w') as file:
+        json.dump(manifest, file)
+
+
+def is_up_to_date(src_path: str, dest_path: str, entry, use_hash: bool):
+    """
+    Check if dest_path does not need to be copied again
+    Files are equal if they have the same size and mtime or,
+    if use_hash is set, the same content hash as recorded in manifest entry
+    """
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src_path)
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+    if src_stat.st_mtime_ns == dest_stat.st_mtime_ns:
+        return True
+    if not use_hash or entry is None:
+        return False
+    return entry == {'size': dest_stat.st_size,
+                     'mtime': dest_stat.st_mtime_ns,
+                     'hash': get_file_hash(src_path)}
+
+
+def remove_extraneous(src: str, dst: str):
+    """
+    Remove files and directories in dst that don't exist in src
+    """
+    for subdir, dirs, files in os.walk(dst, topdown=False):
+        for name in files + dirs:
+            dest_path = os.path.join(subdir, name)
+            if dest_path == os.path.join(dst, MANIFEST_NAME):
+                continue
+            src_path = os.path.join(src, os.path.relpath(dest_path, dst))
+            if os.path.lexists(src_path):
+                continue
+            if name in dirs and not os.path.islink(dest_path):
+                shutil.rmtree(dest_path)
+            else:
+                os.remove(dest_path)
+
+
+def sync_tree(src: str, dst: str, jobs: int = 1, use_hash: bool = False,
+              delete: bool = False) -> (int, int):
+    """
+    Copy only changed files from src to dst
+    Returns tuple of copied bytes count and skipped bytes count
+    """
+    manifest = load_manifest(dst) if use_hash else dict()
+    new_manifest = dict()
+    to_copy = []
+    copied_bytes = 0
+    skipped_bytes = 0
+    for src_path, dest_path in all_files(src, dst):
+        key = os.path.relpath(dest_path, dst)
+        size = os.path.getsize(src_path)
+        if is_up_to_date(src_path, dest_path, manifest.get(key), use_hash):
+            skipped_bytes += size
+            if key in manifest:
+                new_manifest[key] = manifest[key]
+        else:
+            copied_bytes += size
+            to_copy.append((src_path, dest_path))
+
+    copy_files(to_copy, jobs, preserve=True)
+
+    if use_hash:
+        for src_path, dest_path in to_copy:
+            dest_stat = os.stat(dest_path)
+            new_manifest[os.path.relpath(dest_path, dst)] = {
+                'size': dest_stat.st_size,
+                'mtime': dest_stat.st_mtime_ns,
+                'hash': get_file_hash(dest_path)
+            }
+        save_manifest(dst, new_manifest)
+    if delete:
+        remove_extraneous(src, dst)
+    return copied_bytes, skipped_bytes
 
 
 def main():
     """
     Main function for copying files
-    usage: python project2_task2_d.py src dst
+    usage: python project2_task2_d.py src dst [--jobs N] [--preserve]\
+    [--sync] [--checksum] [--delete]
     """
     parser = argparse.ArgumentParser(description='Copy files')
     parser.add_argument('src', type=str, help='path to source')
     parser.add_argument('dst', type=str, help='path to destination')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of parallel copying processes')
+    parser.add_argument('--preserve', action='store_true',
+                        help='Preserve permissions and modification times')
+    parser.add_argument('--sync', action='store_true',
+                        help='Copy only files that were changed')
+    parser.add_argument('--checksum', action='store_true',
+                        help='Compare content hashes in sync mode')
+    parser.add_argument('--delete', action='store_true',
+                        help='Delete extraneous files from dst in sync mode')
     args = parser.parse_args()
 
     if not os.path.isdir(args.src):
         print("Directory was not found at the specified src path")
     else:
         try:
-            copy_tree(args.src, args.dst)
+            if args.sync:
+                copied, skipped = sync_tree(args.src, args.dst, args.jobs,
+                                            args.checksum, args.delete)
+                print(f"Copied {copied} bytes, skipped {skipped} bytes")
+            else:
+                copy_tree(args.src, args.dst, args.jobs, args.preserve)
         except PermissionError:
             print("Permission denied. Please run with sudo.")
 
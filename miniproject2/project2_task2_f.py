@@ -2,50 +2,521 @@
 Module for searching plain-text data sets for lines that match a regex.
 """
 import argparse
+import json
 import os
 import re
-from typing import Dict
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import repeat
+from typing import Callable, Dict, Iterable, Iterator, List, Optional,\
+    Pattern, Set, Tuple, Union
 
+REGEX_METACHARACTERS = set('.^$*+?{}[]|()')
+# escapes with arguments like \x41, \u0041, \N{DIGIT ONE} or \12,
+# escaped backslash is matched first, so \\x41 is left as is
+ESCAPE_WITH_ARGUMENTS = re.compile(
+    r'\\\\|\\(?:[xuU0-9][0-9a-fA-F]*|N\{[^}]*\})')
 
-def get_matched_files(file_pattern: str):
+
+def glob_to_regex(glob: str) -> str:
+    """
+    Translates glob pattern to regex
+    * and ? don't match /, ** matches any number of directories
+    >>> glob_to_regex('src/**/*.py')
+    'src/(?:.*/)?[^/]*\\\\.py'
+    >>> glob_to_regex('[!a]?')
+    '[^a][^/]'
+    """
+    regex = []
+    idx = 0
+    while idx < len(glob):
+        char = glob[idx]
+        if glob.startswith('**/', idx):
+            regex.append('(?:.*/)?')
+            idx += 3
+            continue
+        if glob.startswith('**', idx):
+            regex.append('.*')
+            idx += 2
+            continue
+        end = glob.find(']', idx + 2)
+        if char == '[' and end != -1:
+            char_class = glob[idx + 1:end].replace('\\', '\\\\')
+            if char_class.startswith('!'):
+                char_class = '^' + char_class[1:]
+            regex.append(f'[{char_class}]')
+            idx = end
+        elif char == '*':
+            regex.append('[^/]*')
+        elif char == '?':
+            regex.append('[^/]')
+        else:
+            regex.append(re.escape(char))
+        idx += 1
+    return ''.join(regex)
+
+
+def glob_to_path_regex(glob: str, base: str = '.') -> str:
+    """
+    Returns regex that matches paths under base, which match glob
+    Glob without / matches file name in any directory
+    >>> glob_to_path_regex('*.py')
+    '\\\\./(?:.*/)?[^/]*\\\\.py\\\\Z'
+    >>> glob_to_path_regex('/src/*.py', './lib')
+    '\\\\./lib/src/[^/]*\\\\.py\\\\Z'
+    """
+    prefix = re.escape(base + '/')
+    if '/' not in glob.rstrip('/'):
+        prefix += '(?:.*/)?'
+    return prefix + glob_to_regex(glob.strip('/')) + '\\Z'
+
+
+def get_path_prefix(file_pattern: str) -> List[Optional[str]]:
+    """
+    Returns characters that every path matching file_pattern starts with
+    None stands for any character
+    >>> get_path_prefix('./src/.*')
+    [None, '/', 's', 'r', 'c', '/']
+    >>> get_path_prefix('\\\\./ab?')
+    ['.', '/', 'a']
+    >>> get_path_prefix('./a|./b')
+    []
+    """
+    prefix = []
+    chars = iter(file_pattern)
+    for char in chars:
+        if char == '\\':
+            char = next(chars, '')
+            if not char or char.isalnum():
+                break  # special sequence like \\w
+            prefix.append(char)
+        elif char == '.':
+            prefix.append(None)
+        elif char in '?*{' and prefix:
+            prefix.pop()  # last char is optional
+            break
+        elif char in REGEX_METACHARACTERS:
+            break
+        else:
+            prefix.append(char)
+    if '|' in file_pattern:
+        return []  # alternation can have any prefix
+    return prefix
+
+
+def can_contain_matches(directory: str, prefix: List[Optional[str]]) -> bool:
+    """
+    Check if paths inside directory can start with prefix
+    >>> can_contain_matches('./src', [None, '/', 's', 'r', 'c', '/'])
+    True
+    >>> can_contain_matches('./node_modules', [None, '/', 's', 'r', 'c'])
+    False
+    """
+    for char, prefix_char in zip(directory + '/', prefix):
+        if prefix_char is None:
+            if char == '\n':
+                return False
+        elif char != prefix_char:
+            return False
+    return True
+
+
+def read_gitignore(directory: str) -> List[Tuple[Pattern, bool, bool]]:
+    """
+    Returns rules from .gitignore in directory
+    as tuples (path regex, is negated, matches only directories)
+    """
+    rules = []
+    try:
+        with open(os.path.join(directory, '.gitignore'), 'r') as file:
+            for line in file:
+                line = line.rstrip('\n')
+                if len(line.strip()) == 0 or line.startswith('#'):
+                    continue
+                is_negated = line.startswith('!')
+                line = line[1:] if is_negated else line
+                regex = glob_to_path_regex(line, directory.rstrip('/'))
+                rules.append((re.compile(regex), is_negated,
+                              line.endswith('/')))
+    except (OSError, UnicodeDecodeError):
+        pass  # no .gitignore or it can't be read
+    return rules
+
+
+def is_ignored(path: str, is_dir: bool,
+               rules: List[Tuple[Pattern, bool, bool]]) -> bool:
+    """
+    Check if path is ignored by rules, the last matching rule wins
+    >>> rules = [(re.compile('.*\\\\.log\\\\Z'), False, False),\
+    (re.compile('.*keep\\\\.log\\\\Z'), True, False)]
+    >>> is_ignored('./a.log', False, rules)
+    True
+    >>> is_ignored('./keep.log', False, rules)
+    False
+    """
+    ignored = False
+    for regex, is_negated, only_dirs in rules:
+        if (is_dir or not only_dirs) and regex.match(path) is not None:
+            ignored = not is_negated
+    return ignored
+
+
+def get_matched_files(file_pattern: str, excludes: Iterable[str] = (),
+                      use_gitignore: bool = False):
     """
     Yields all files under current directory that match the pattern
+    Directories that can't contain matching paths are not visited
+    Paths that match excludes globs (or .gitignore rules) are skipped
     """
-    for subdir, dirs, files in os.walk('./'):  # search in current directory
-        for file in files:
-            file_path = os.path.join(subdir, file)
-            if re.match(file_pattern, file_path) is not None:
-                yield file_path
+    file_regex = re.compile(file_pattern)
+    prefix = []
+    if not file_regex.flags & re.IGNORECASE:
+        prefix = get_path_prefix(file_regex.pattern)
+    exclude_rules = [(re.compile(glob_to_path_regex(exclude)), False, False)
+                     for exclude in excludes]
+
+    stack = [('./', exclude_rules)]  # search in current directory
+    while stack:
+        directory, rules = stack.pop()
+        if use_gitignore:
+            rules = rules + read_gitignore(directory)
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    path = os.path.join(directory, entry.name)
+                    is_dir = entry.is_dir()
+                    if is_ignored(path, is_dir, rules):
+                        continue
+                    if not is_dir:
+                        if file_regex.match(path) is not None:
+                            yield path
+                    elif not entry.is_symlink() and \
+                            can_contain_matches(path, prefix):
+                        subdirs.append((path, rules))
+        except OSError:
+            continue  # directory can't be listed, like os.walk does
+        stack.extend(reversed(subdirs))
+
+
+def get_literal(search_pattern: str) -> Optional[str]:
+    """
+    Returns plain string matched by search_pattern,
+    or None if search_pattern uses regex features
+    >>> get_literal('import os')
+    'import os'
+    >>> get_literal(re.escape('a.b'))
+    'a.b'
+    >>> get_literal('a.b') is None
+    True
+    """
+    literal = []
+    is_escaped = False
+    for char in search_pattern:
+        if is_escaped:
+            if char.isalnum():
+                return None  # special sequence like \\d or \\1
+            literal.append(char)
+            is_escaped = False
+        elif char == '\\':
+            is_escaped = True
+        elif char in REGEX_METACHARACTERS:
+            return None
+        else:
+            literal.append(char)
+    if is_escaped:
+        return None
+    return ''.join(literal)
+
+
+def get_trie_regex(words: List[str]) -> str:
+    """
+    Returns regex that matches any of words
+    Words are merged into a prefix tree, so regex engine checks
+    all of them in one pass, preferring the longest one
+    >>> get_trie_regex(['ab', 'abc', 'ad'])
+    'a(?:b(?:c)?|d)'
+    """
+    trie = dict()
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, dict())
+        node[''] = dict()  # end of word
+
+    def node_to_regex(node: dict) -> str:
+        branches = [re.escape(char) + node_to_regex(child)
+                    for char, child in sorted(node.items()) if char]
+        if len(branches) == 0:
+            return ''
+        regex = branches[0]
+        if len(branches) > 1:
+            regex = '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            if len(branches) == 1:
+                regex = f'(?:{regex})'
+            regex += '?'
+        return regex
+
+    return node_to_regex(trie)
+
+
+def compile_patterns(patterns: List[str], fixed: bool = False) -> Pattern:
+    """
+    Compiles all patterns into one regex, that matches any of them
+    If fixed is True, patterns are treated as plain strings
+    >>> compile_patterns(['a', 'b|c']).pattern
+    '(?:a)|(?:b|c)'
+    >>> compile_patterns(['a', 'a.b'], fixed=True).pattern
+    'a(?:\\\\.b)?'
+    """
+    literals = patterns if fixed else list(map(get_literal, patterns))
+    if None not in literals:
+        return re.compile(get_trie_regex(literals))
+    if len(patterns) == 1:
+        return re.compile(patterns[0])
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+
+def get_line_matcher(search_pattern: Pattern) -> Callable[[str], bool]:
+    """
+    Returns function that checks if line contains pattern
+    Plain string patterns are checked with fast substring search
+    >>> get_line_matcher(re.compile('ab'))('cabd')
+    True
+    >>> get_line_matcher(re.compile('a+b'))('cd')
+    False
+    """
+    literal = get_literal(search_pattern.pattern)
+    if literal is not None and search_pattern.flags == re.UNICODE:
+        return lambda line: literal in line
+    search = search_pattern.search
+    return lambda line: search(line) is not None
 
 
-def search_lines(path: str, search_pattern: str) -> Dict[int, str]:
+def search_lines(path: str,
+                 search_pattern: Union[str, Pattern]) -> Dict[int, str]:
     """
     (str, str) -> Dict[line_number, line]
     Returns all lines in file, located at path, which contain pattern
+    File is read line by line, so it is never loaded into memory at once
     """
     try:
+        is_matched = get_line_matcher(re.compile(search_pattern))
         matched_lines = dict()
         with open(path, 'r') as file:
-            lines = file.readlines()
-            for idx, line in enumerate(lines):
-                if re.search(search_pattern, line) is not None:
+            for idx, line in enumerate(file):
+                if is_matched(line):
                     matched_lines[idx + 1] = line.strip()
         return matched_lines
     except (PermissionError, UnicodeDecodeError, Exception):
         return dict()  # Maybe access to file is restricted or it's binary
 
 
-def match(file_pattern: str, search_pattern: str) -> Dict[str, Dict[int, str]]:
+def get_trigrams(text: str) -> Set[str]:
+    """
+    Returns all substrings of length 3
+    >>> sorted(get_trigrams('abcde'))
+    ['abc', 'bcd', 'cde']
+    """
+    return {text[idx:idx + 3] for idx in range(len(text) - 2)}
+
+
+def get_required_literals(search_pattern: str) -> List[str]:
+    """
+    Returns plain strings that every match of search_pattern contains
+    Only top level of regex is analyzed, alternations give no strings
+    >>> get_required_literals('def (\\w+)\\(self')
+    ['def ', '(self']
+    >>> get_required_literals('abcd?e')
+    ['abc', 'e']
+    >>> get_required_literals('a|b')
+    []
+    >>> get_required_literals('xy{10,20}z')
+    ['x', 'z']
+    >>> get_required_literals('[]abc]xyz[^]]q')
+    ['xyz', 'q']
+    >>> get_required_literals(r'ab\\x41cd')
+    ['ab']
+    >>> get_required_literals(r'(a)b\\1c\\\\x41')
+    ['b', '\\\\x41']
+    """
+    literals = []
+    current = []
+    depth = 0
+    # arguments of escapes are not literal text, replace them with any char
+    search_pattern = ESCAPE_WITH_ARGUMENTS.sub(
+        lambda found: found.group() if found.group() == '\\\\' else '.',
+        search_pattern)
+    chars = iter(search_pattern)
+    for char in chars:
+        if char == '\\':
+            char = next(chars, '')
+            if depth == 0 and char and not char.isalnum():
+                current.append(char)
+                continue
+            char = ''  # special sequence like \\w
+        elif depth == 0 and char not in REGEX_METACHARACTERS:
+            current.append(char)
+            continue
+        elif char in '?*{' and depth == 0 and current:
+            current.pop()  # last char is optional
+        if char == '{':
+            for char in chars:  # skip {m,n} quantifier
+                if char == '}':
+                    break
+        elif char == '|':
+            return []
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '[':
+            char = next(chars, '')
+            if char == '^':
+                char = next(chars, '')
+            while char:  # skip character class, leading ] is literal
+                if char == '\\':
+                    next(chars, '')
+                char = next(chars, '')
+                if char == ']':
+                    break
+        literals.append(''.join(current))
+        current = []
+    literals.append(''.join(current))
+    return [literal for literal in literals if len(literal) > 0]
+
+
+def get_index_entry(path: str) -> dict:
+    """
+    Returns index entry with modification time and trigrams of file
+    Trigrams are None if file can't be read as text
+    """
+    entry = {'mtime': os.stat(path).st_mtime_ns, 'trigrams': None}
+    try:
+        trigrams = set()
+        with open(path, 'r') as file:
+            for line in file:
+                trigrams.update(get_trigrams(line))
+        entry['trigrams'] = ''.join(sorted(trigrams))
+    except (PermissionError, UnicodeDecodeError, Exception):
+        pass  # Maybe access to file is restricted or it's binary
+    return entry
+
+
+def load_index(path: str) -> dict:
+    """
+    Loads trigram index from path
+    Returns empty index if there is no index at path
+    """
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return dict()
+
+
+def save_index(path: str, index: dict):
+    """
+    Saves trigram index to path
+    """
+    with open(path, 'w') as file:
+        json.dump(index, file)
+
+
+def update_index(index: dict, file_pattern: str,
+                 walk_options: Optional[dict] = None) -> dict:
+    """
+    Returns index of all files that match file_pattern
+    Entries of files that were not modified are reused
+    walk_options are passed to get_matched_files
+    """
+    new_index = dict()
+    for file in get_matched_files(file_pattern, **(walk_options or {})):
+        entry = index.get(file)
+        if entry is None or entry['mtime'] != os.stat(file).st_mtime_ns:
+            entry = get_index_entry(file)
+        new_index[file] = entry
+    return new_index
+
+
+def prune_files(files: Iterable[str], index: dict, search_pattern: Pattern,
+                stats: dict) -> Iterator[str]:
+    """
+    Yields files that may contain search_pattern according to index
+    Files that are not indexed or were modified are always yielded
+    Counts of all and pruned files are stored in stats
+    """
+    stats['total'] = stats['pruned'] = 0
+    required = set()
+    # literals of case-insensitive or verbose patterns aren't plain text
+    if not search_pattern.flags & (re.IGNORECASE | re.VERBOSE):
+        for literal in get_required_literals(search_pattern.pattern):
+            required.update(get_trigrams(literal))
+
+    for file in files:
+        stats['total'] += 1
+        entry = index.get(file)
+        if required and entry is not None and \
+                entry['trigrams'] is not None and \
+                entry['mtime'] == os.stat(file).st_mtime_ns:
+            trigrams = entry['trigrams']
+            trigrams = {trigrams[idx:idx + 3]
+                        for idx in range(0, len(trigrams), 3)}
+            if not required <= trigrams:
+                stats['pruned'] += 1
+                continue
+        yield file
+
+
+def search_files(file_pattern: str, search_pattern: Union[str, Pattern],
+                 jobs: int = 1, ordered: bool = True,
+                 index: Optional[dict] = None,
+                 stats: Optional[dict] = None,
+                 walk_options: Optional[dict] = None
+                 ) -> Iterator[Tuple[str, Dict[int, str]]]:
+    """
+    Yields (filename, Dict[line_number, line]) for files with matched lines
+    If jobs > 1, files are searched by a pool of worker processes
+    If ordered is False, results are yielded as soon as they are ready
+    If trigram index is given, files that can't match are skipped
+    walk_options are passed to get_matched_files
+    """
+    files = get_matched_files(file_pattern, **(walk_options or {}))
+    search_pattern = re.compile(search_pattern)
+    if index is not None:
+        files = prune_files(files, index, search_pattern,
+                            dict() if stats is None else stats)
+    if jobs <= 1:
+        for file in files:
+            lines = search_lines(file, search_pattern)
+            if len(lines) > 0:
+                yield file, lines
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        if ordered:
+            files = list(files)
+            results = zip(files, executor.map(search_lines, files,
+                                              repeat(search_pattern),
+                                              chunksize=16))
+        else:
+            futures = {executor.submit(search_lines, file, search_pattern):
+                       file for file in files}
+            results = ((futures[future], future.result())
+                       for future in as_completed(futures))
+        for file, lines in results:
+            if len(lines) > 0:
+                yield file, lines
+
+
+def match(file_pattern: str, search_pattern: str,
+          jobs: int = 1) -> Dict[str, Dict[int, str]]:
     """
     (str, str) -> Dict[filename, Dict[line_number, line]]
     Returns all files that have matched lines
     """
-    matches = dict()
-    for file in get_matched_files(file_pattern):
-        lines = search_lines(file, search_pattern)
-        if len(lines) > 0:
-            matches[file] = lines
-    return matches
+    return dict(search_files(file_pattern, search_pattern, jobs))
 
 
 def get_colorcode_by_str(color: str) -> int:
@@ -72,24 +543,29 @@ def make_colored(text: str, color: str, bold: bool) -> str:
     return f"\033[{int(bold)};{get_colorcode_by_str(color)}m{text}\033[0m"
 
 
-def highlight_match(line: str, search_pattern: str) -> str:
+def highlight_match(line: str, search_pattern: Union[str, Pattern]) -> str:
     """
     Highlights matched pattern in line with red color
     >>> highlight_match("Romanyuk TOP, but python sucks", 'o')
     'R\\x1b[1;31mo\\x1b[0mmanyuk TOP, but pyth\\x1b[1;31mo\\x1b[0mn sucks'
     """
-    return re.sub(search_pattern,
-                  lambda x: make_colored(x.group(), 'red', True), line)
+    return re.compile(search_pattern).sub(
+        lambda x: make_colored(x.group(), 'red', True), line)
 
 
 def print_matches(file_pattern: str, search_pattern: str, count_only: bool,
-                  show_lines: bool):
+                  show_lines: bool, jobs: int = 1, ordered: bool = True,
+                  index: Optional[dict] = None,
+                  walk_options: Optional[dict] = None):
     """
     Prints all matches
     """
-    matches = match(file_pattern, search_pattern)
+    search_pattern = re.compile(search_pattern)
+    stats = dict()
+    matches = search_files(file_pattern, search_pattern, jobs, ordered,
+                           index, stats, walk_options)
 
-    for filename, matched_lines in matches.items():
+    for filename, matched_lines in matches:
         print(make_colored(filename, 'blue', True), end='')
         if count_only:
             print(f': {len(matched_lines)}')
@@ -101,27 +577,123 @@ def print_matches(file_pattern: str, search_pattern: str, count_only: bool,
                           end=': ')
                 print(highlight_match(line, search_pattern))
 
+    if index is not None and stats['total'] > 0:
+        print(f"Index pruned {stats['pruned']} of {stats['total']} files "
+              f"({stats['pruned'] / stats['total']:.0%})")
+
+
+def add_walk_arguments(parser: argparse.ArgumentParser):
+    """
+    Adds arguments that control which files are searched
+    """
+    parser.add_argument('--glob', action='store_true',
+                        help='Treat file pattern as glob, like src/**/*.py')
+    parser.add_argument('--exclude', action='append', default=[],
+                        help='Skip files and directories matching glob, '
+                             'can be repeated')
+    parser.add_argument('--gitignore', action='store_true',
+                        help='Skip files ignored by .gitignore files')
+
+
+def get_walk_options(args: argparse.Namespace) -> (str, dict):
+    """
+    Returns file pattern regex and walk options from parsed arguments
+    """
+    file_pattern = args.file_pattern
+    if args.glob:
+        file_pattern = glob_to_path_regex(file_pattern)
+    return file_pattern, {'excludes': args.exclude,
+                          'use_gitignore': args.gitignore}
+
+
+def index_main():
+    """
+    Main function for building trigram index
+    usage: python project2_task2_f.py index {build,update} file_pattern\
+    --index PATH
+    """
+    parser = argparse.ArgumentParser(description='grep index',
+                                     prog='project2_task2_f.py index')
+    parser.add_argument('command', choices=['build', 'update'],
+                        help='build new index or update existing one')
+    parser.add_argument('file_pattern', type=str, help='file pattern')
+    parser.add_argument('--index', type=str, required=True,
+                        help='path to index')
+    add_walk_arguments(parser)
+    args = parser.parse_args(sys.argv[2:])
+
+    try:
+        index = dict()
+        if args.command == 'update':
+            index = load_index(args.index)
+        index = update_index(index, *get_walk_options(args))
+        save_index(args.index, index)
+        print(f"Indexed {len(index)} files")
+    except PermissionError:
+        print("Permission denied. Please run with sudo.")
+    except (IsADirectoryError, ValueError):
+        print("Specified index path is not a valid index")
+
 
 def main():
     """
     Main function for searching text aka grep
     usage: python project2_task2_f.py str_pattern file_pattern [show_lines]\
-    [only_show_counts]
+    [only_show_counts] [--jobs N] [--unordered] [-F] [--index PATH]\
+    [--glob] [--exclude GLOB] [--gitignore]
+    or: python project2_task2_f.py -e str_pattern [-e str_pattern ...]\
+    file_pattern [...]
+    or: python project2_task2_f.py index {build,update} file_pattern\
+    --index PATH
     """
+    if len(sys.argv) > 1 and sys.argv[1] == 'index':
+        index_main()
+        return
+
     parser = argparse.ArgumentParser(description='grep')
-    parser.add_argument('str_pattern', type=str, help='string pattern')
-    parser.add_argument('file_pattern', type=str, help='file pattern')
+    parser.add_argument('str_pattern', type=str, nargs='?',
+                        help='string pattern')
+    parser.add_argument('file_pattern', type=str, nargs='?',
+                        help='file pattern')
+    parser.add_argument('-e', dest='patterns', action='append',
+                        help='string pattern, can be repeated')
+    parser.add_argument('-F', dest='fixed', action='store_true',
+                        help='Treat string patterns as plain strings')
     parser.add_argument('--show_lines', action='store_true',
                         help='Show lines')
     parser.add_argument('--only_show_counts', action='store_true',
                         help='Only show counts')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of parallel searching processes')
+    parser.add_argument('--unordered', action='store_true',
+                        help='Print results as soon as they are found')
+    parser.add_argument('--index', type=str,
+                        help='path to trigram index to skip files faster')
+    add_walk_arguments(parser)
     args = parser.parse_args()
 
+    if args.patterns:
+        if args.file_pattern is not None:
+            parser.error('unexpected argument: ' + args.file_pattern)
+        args.file_pattern = args.str_pattern
+    elif args.str_pattern is not None:
+        args.patterns = [args.str_pattern]
+    if args.file_pattern is None:
+        parser.error('the following arguments are required: file_pattern')
+
     try:
-        print_matches(args.file_pattern, args.str_pattern,
-                      args.only_show_counts, args.show_lines)
+        search_pattern = compile_patterns(args.patterns, args.fixed)
+        index = None if args.index is None else load_index(args.index)
+        file_pattern, walk_options = get_walk_options(args)
+        print_matches(file_pattern, search_pattern,
+                      args.only_show_counts, args.show_lines,
+                      args.jobs, not args.unordered, index, walk_options)
     except PermissionError:
         print("Permission denied. Please run with sudo.")
+    except re.error:
+        print("Specified string pattern is not a valid regex")
+    except (IsADirectoryError, ValueError):
+        print("Specified index path is not a valid index")
 
 
 if __name__ == "__main__":
@@ -2,45 +2,171 @@
 Module for archiving files that contain text that matches the pattern
 """
 import argparse
+import codecs
+import copy
 import os
 import re
+import shutil
 import zipfile
-from zipfile import ZipFile
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List, Pattern, Tuple, Union
+from zipfile import ZipFile, ZipInfo
 
+from project2_task3_c import RAW_WRITE_SUPPORTED, copy_raw_member
 
-def match(data: bytes, pattern: str) -> bool:
+CHUNK_SIZE = 1024 * 1024
+# matches are searched in windows that overlap by this many characters,
+# so a match up to OVERLAP // 2 characters long is found on a chunk border
+OVERLAP = 64 * 1024
+
+
+def match_stream(file: BinaryIO, pattern: Union[str, Pattern]) -> bool:
     """
-    Check if data contain text that matches the pattern
+    Check if file contains text that matches the pattern
+    File is read by chunks, reading stops at the first match
     If bytes can't be decoded returns false
+    >>> import io
+    >>> match_stream(io.BytesIO('Привіт, світ'.encode()), 'сві?т')
+    True
+    >>> match_stream(io.BytesIO(b'\\xff hello'), 'hello')
+    False
+    >>> match_stream(io.BytesIO(b'a' * (CHUNK_SIZE - 2) + b'bc\\n'), 'abc$')
+    True
+    >>> match_stream(io.BytesIO(b'a' * 3 * CHUNK_SIZE + b'b'), '^b')
+    False
+    >>> match_stream(io.BytesIO(b'abc' + b'x' * 2 * CHUNK_SIZE), 'abc.*')
+    True
+    >>> match_stream(io.BytesIO(b'abc' + b'x' * 2 * CHUNK_SIZE), 'abc(x+)$')
+    True
     """
+    search = re.compile(pattern).search
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    text = ''
+    position = 0  # first window is searched from the real string start
     try:
-        return re.search(pattern, data.decode(encoding='utf-8')) is not None
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+            is_last = len(chunk) == 0
+            text += decoder.decode(chunk, final=is_last)
+            found = search(text, position)
+            # match near the window end can depend on text that follows
+            if found is not None and \
+                    (is_last or found.end() <= len(text) - OVERLAP // 2):
+                return True
+            if is_last:
+                return False
+            if len(text) > OVERLAP:
+                cut = len(text) - OVERLAP
+                if found is not None:
+                    # match rejected by its end can grow with next chunks,
+                    # keep it with one char before it as context
+                    cut = min(cut, max(found.start() - 1, 0))
+                if cut > 0:
+                    text = text[cut:]
+                    position = 1  # ^ must not match mid-file
     except UnicodeDecodeError:
         return False  # probably file is binary
 
 
-def all_files(path: str, pattern: str):
+def scan_members(path: str, pattern: Union[str, Pattern], start: int,
+                 stop: int) -> List[int]:
+    """
+    Returns indices of members of archived file from start to stop
+    that match the pattern
+    """
+    indices = []
+    with ZipFile(path, 'r') as zip_file:
+        infos = zip_file.infolist()
+        for index in range(start, stop):
+            with zip_file.open(infos[index]) as member:
+                if match_stream(member, pattern):
+                    indices.append(index)
+    return indices
+
+
+def split_members(infos: List[ZipInfo], parts: int) -> List[Tuple[int, int]]:
+    """
+    Split infos into slices (start, stop) of about the same compressed size
+    Each slice contains at least one member
+    >>> infos = [ZipInfo(str(i)) for i in range(5)]
+    >>> for info, size in zip(infos, [10, 1, 1, 1, 1]):
+    ...     info.compress_size = size
+    >>> split_members(infos, 3)
+    [(0, 1), (1, 5)]
+    """
+    total = sum(info.compress_size for info in infos)
+    limit = max(1, total // parts)
+    slices = []
+    start = size = 0
+    for index, info in enumerate(infos):
+        size += info.compress_size
+        if size >= limit:
+            slices.append((start, index + 1))
+            start, size = index + 1, 0
+    if start < len(infos):
+        slices.append((start, len(infos)))
+    return slices
+
+
+def all_files(path: str, pattern: str, jobs: int = 1) -> Iterator[ZipInfo]:
     """
-    Yields all files at archived file that match the pattern
+    Yields infos of all files at archived file that match the pattern
+    If jobs > 1, slices of members are scanned by a pool of worker processes,
+    each opening the archive on its own, infos are yielded in the same order
     """
+    pattern = re.compile(pattern)
+    if jobs <= 1:
+        with ZipFile(path, 'r') as zip_file:
+            for file in zip_file.infolist():
+                with zip_file.open(file) as member:
+                    if match_stream(member, pattern):
+                        yield file
+        return
+
     with ZipFile(path, 'r') as zip_file:
-        for file in zip_file.infolist():
-            file_bytes = zip_file.read(file.filename)
-            if match(file_bytes, pattern):
-                yield file.filename, file_bytes
+        infos = zip_file.infolist()
+    if len(infos) == 0:
+        return
+    # few slices per worker, so a slow slice doesn't stall the others
+    slices = split_members(infos, 4 * jobs)
+    starts, stops = zip(*slices)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for indices in executor.map(scan_members, [path] * len(slices),
+                                    [pattern] * len(slices), starts, stops):
+            for index in indices:
+                yield infos[index]
+
+
+def copy_member(src_zip: ZipFile, src_file: BinaryIO, zip_file: ZipFile,
+                info: ZipInfo):
+    """
+    Copy member from src_zip (opened from src_file) to zip_file
+    Compressed data is reused if possible, otherwise member is streamed
+    """
+    is_encrypted = info.flag_bits & 0x1
+    if RAW_WRITE_SUPPORTED and zip_file._seekable and not is_encrypted:
+        new_info = copy.copy(info)
+        # sizes and CRC are known, so data descriptor is not needed
+        new_info.flag_bits &= ~zipfile._MASK_USE_DATA_DESCRIPTOR
+        copy_raw_member(src_file, zip_file, new_info, info)
+    else:
+        with src_zip.open(info) as member, zip_file.open(info, 'w') as file:
+            shutil.copyfileobj(member, file, CHUNK_SIZE)
 
 
-def archive(src: str, dst: str, pattern: str):
+def archive(src: str, dst: str, pattern: str, jobs: int = 1):
     """
     Archive all files that match the pattern
+    If jobs > 1, members are scanned by a pool of worker processes
     """
     dirname = os.path.dirname(dst)
     if len(dirname) > 0:
         os.makedirs(dirname, exist_ok=True)
     try:
-        with ZipFile(dst, 'w') as zip_file:
-            for filename, file_bytes in all_files(src, pattern):
-                zip_file.writestr(filename, file_bytes)
+        with ZipFile(dst, 'w') as zip_file, open(src, 'rb') as src_file, \
+                ZipFile(src_file, 'r') as src_zip:
+            for info in all_files(src, pattern, jobs):
+                copy_member(src_zip, src_file, zip_file, info)
     except zipfile.BadZipfile as e:
         os.remove(dst)  # clean up
         raise e
@@ -49,17 +175,19 @@ def archive(src: str, dst: str, pattern: str):
 def main():
     """
     Main function for archiving
-    usage: python project2_task3_a.py pattern src dst
+    usage: python project2_task3_a.py pattern src dst [--jobs N]
     """
     parser = argparse.ArgumentParser(description='Archiver')
     parser.add_argument('pattern', type=str, help='pattern')
     parser.add_argument('src', type=str, help='path to source')
     parser.add_argument('dst', type=str, help='path to destination')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of parallel scanning processes')
     args = parser.parse_args()
 
     try:
         if os.path.exists(args.src):
-            archive(args.src, args.dst, args.pattern)
+            archive(args.src, args.dst, args.pattern, args.jobs)
         else:
             print("Cannot find any file or directory in specified source path")
     except PermissionError:
@@ -2,8 +2,31 @@
 Module for archiving
 """
 import argparse
+import hashlib
 import os
-from zipfile import ZipFile
+import sys
+import tempfile
+import zipfile
+import zlib
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from typing import BinaryIO, Dict, Iterable, Optional
+from zipfile import ZipFile, ZipInfo
+
+CHUNK_SIZE = 1024 * 1024
+# writing already compressed data relies on private ZipFile internals
+# (_MASK_* flags, _writecheck, start_dir) as they are in Python 3.11+,
+# older versions always compress files serially with ZipFile.write,
+# project2_task3_a copies members with copy_raw_member under the same check
+RAW_WRITE_SUPPORTED = sys.version_info >= (3, 11)
+METHODS = {
+    'stored': zipfile.ZIP_STORED,
+    'deflate': zipfile.ZIP_DEFLATED,
+    'bzip2': zipfile.ZIP_BZIP2,
+    'lzma': zipfile.ZIP_LZMA
+}
 
 
 def all_files(path: str):
@@ -18,30 +41,308 @@ def all_files(path: str):
                 yield os.path.join(subdir, file)
 
 
-def archive(src: str, dst: str):
+def compress_file(path: str, compression: int,
+                  compresslevel: int = None) -> (str, int, int, int):
+    """
+    Compress file into temporary file
+    Returns tuple of temporary file path, CRC, file size and compressed size
+    """
+    compressor = zipfile._get_compressor(compression, compresslevel)
+    crc = file_size = 0
+    with open(path, 'rb') as file, \
+            tempfile.NamedTemporaryFile(delete=False) as tmp:
+        try:
+            while True:
+                chunk = file.read(CHUNK_SIZE)
+                if len(chunk) == 0:
+                    break
+                crc = zlib.crc32(chunk, crc)
+                file_size += len(chunk)
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                tmp.write(chunk)
+            if compressor is not None:
+                tmp.write(compressor.flush())
+            return tmp.name, crc, file_size, tmp.tell()
+        except BaseException as e:
+            tmp.close()
+            os.remove(tmp.name)  # clean up
+            raise e
+
+
+def write_raw(zip_file: ZipFile, info: ZipInfo, data: BinaryIO):
+    """
+    Append info.compress_size bytes of already compressed data to zip_file
+    Uses ZipFile internals the same way as ZipFile.mkdir does (3.11+)
+    """
+    if info.compress_type == zipfile.ZIP_LZMA:
+        # compressed data includes an end-of-stream marker
+        info.flag_bits |= zipfile._MASK_COMPRESS_OPTION_1
+    zip64 = info.file_size > zipfile.ZIP64_LIMIT or \
+        info.compress_size > zipfile.ZIP64_LIMIT
+    with zip_file._lock:
+        zip_file.fp.seek(zip_file.start_dir)
+        info.header_offset = zip_file.fp.tell()
+        zip_file._writecheck(info)
+        zip_file._didModify = True
+        zip_file.filelist.append(info)
+        zip_file.NameToInfo[info.filename] = info
+        zip_file.fp.write(info.FileHeader(zip64))
+        remaining = info.compress_size
+        while remaining > 0:
+            chunk = data.read(min(CHUNK_SIZE, remaining))
+            if len(chunk) == 0:
+                raise zipfile.BadZipfile('Truncated file ' + info.filename)
+            zip_file.fp.write(chunk)
+            remaining -= len(chunk)
+        zip_file.start_dir = zip_file.fp.tell()
+
+
+def write_compressed(zip_file: ZipFile, info: ZipInfo, data_path: str):
+    """
+    Append already compressed data from data_path to zip_file
+    """
+    with open(data_path, 'rb') as data:
+        write_raw(zip_file, info, data)
+
+
+def copy_raw_member(src_file: BinaryIO, zip_file: ZipFile, info: ZipInfo,
+                    src_info: ZipInfo):
+    """
+    Write compressed data of src_info member of zip opened from src_file
+    to zip_file as info, without decompressing and compressing it again
+    """
+    info.compress_type = src_info.compress_type
+    info.CRC = src_info.CRC
+    info.file_size = src_info.file_size
+    info.compress_size = src_info.compress_size
+    info.flag_bits |= src_info.flag_bits & zipfile._MASK_COMPRESS_OPTION_1
+
+    zip_file.fp.flush()  # src_file may be zip_file itself opened for reading
+    src_file.seek(src_info.header_offset)
+    header = src_file.read(zipfile.sizeFileHeader)
+    name_length, extra_length = int.from_bytes(header[26:28], 'little'), \
+        int.from_bytes(header[28:30], 'little')
+    src_file.seek(name_length + extra_length, os.SEEK_CUR)
+    write_raw(zip_file, info, src_file)
+
+
+def file_checksums(path: str) -> (int, bytes):
+    """
+    Returns CRC and SHA-256 digest of file content
+    """
+    crc = 0
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+            if len(chunk) == 0:
+                break
+            crc = zlib.crc32(chunk, crc)
+            digest.update(chunk)
+    return crc, digest.digest()
+
+
+def dos_date_time(date_time: tuple) -> tuple:
+    """
+    Returns date_time as it is stored in zip, with seconds rounded down
+    to even number
+    >>> dos_date_time((2020, 1, 2, 3, 4, 5))
+    (2020, 1, 2, 3, 4, 4)
+    """
+    return date_time[:5] + (date_time[5] // 2 * 2,)
+
+
+def is_reusable(old_info: Optional[ZipInfo], info: ZipInfo,
+                compression: int) -> bool:
+    """
+    Check if compressed data of old_info can be used for info
+    """
+    return old_info is not None and not old_info.flag_bits & 0x1 and \
+        old_info.compress_type == compression and \
+        old_info.file_size == info.file_size
+
+
+def write_result(zip_file: ZipFile, info: ZipInfo, future):
+    """
+    Write file compressed by compress_file in worker to zip_file
+    """
+    data_path, info.CRC, info.file_size, info.compress_size = future.result()
+    try:
+        write_compressed(zip_file, info, data_path)
+    finally:
+        os.remove(data_path)
+
+
+def discard_results(futures: Iterable[Optional[Future]]):
+    """
+    Cancel futures of compress_file or wait for them
+    and remove their temporary files
+    """
+    for future in futures:
+        if future is None or future.cancel():
+            continue
+        try:
+            os.remove(future.result()[0])
+        except Exception:
+            pass  # compress_file failed and cleaned up itself
+
+
+def submit(executor: Optional[ProcessPoolExecutor], function, *args) -> Future:
+    """
+    Submit function to executor or run it immediately if executor is None
+    """
+    if executor is not None:
+        return executor.submit(function, *args)
+    future = Future()
+    try:
+        future.set_result(function(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def update_archive(src: str, dst: str, jobs: int = 1,
+                   compression: int = zipfile.ZIP_STORED,
+                   compresslevel: int = None):
+    """
+    Zip src and save to dst reusing compressed data of existing dst archive
+    Entry is unchanged if its size and either mtime or CRC are the same,
+    only changed and new files are compressed, deleted ones are dropped
+    Files with identical content are compressed only once
+    """
+    src_dir = os.path.dirname(src) if os.path.isfile(src) else src
+    entries = [(file, ZipInfo.from_file(file, os.path.relpath(file, src_dir)))
+               for file in all_files(src)
+               if os.path.abspath(file) != os.path.abspath(dst)]
+    sizes = Counter(info.file_size for _, info in entries)
+    tmp_path = dst + '.tmp'
+    try:
+        with ExitStack() as stack:
+            old_file = None
+            old_infos: Dict[str, ZipInfo] = dict()
+            if zipfile.is_zipfile(dst):
+                old_file = stack.enter_context(open(dst, 'rb'))
+                with ZipFile(old_file, 'r') as old_zip:
+                    old_infos = {info.filename: info
+                                 for info in old_zip.infolist()}
+            zip_file = stack.enter_context(
+                ZipFile(tmp_path, 'w', compression,
+                        compresslevel=compresslevel))
+            out_file = stack.enter_context(open(tmp_path, 'rb'))
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=jobs)) if jobs > 1 else None
+
+            written: Dict[bytes, ZipInfo] = dict()  # content digest -> info
+            pending = deque()
+            stack.callback(lambda: discard_results(
+                future for future, _ in pending))
+            for file, info in entries:
+                info.compress_type = compression
+                old_info = old_infos.get(info.filename)
+                reusable = is_reusable(old_info, info, compression)
+                future = crc = digest = None
+                if not reusable or \
+                        old_info.date_time != dos_date_time(info.date_time):
+                    # content is read only if it can be reused or deduplicated
+                    if reusable or \
+                            (info.file_size > 0 and sizes[info.file_size] > 1):
+                        crc, digest = file_checksums(file)
+                    if digest is not None:
+                        written.setdefault(digest, info)
+
+                if reusable and (crc is None or crc == old_info.CRC):
+                    write = partial(copy_raw_member, old_file, zip_file, info,
+                                    old_info)
+                elif digest is not None and written[digest] is not info:
+                    write = partial(copy_raw_member, out_file, zip_file, info,
+                                    written[digest])
+                else:
+                    future = submit(executor, compress_file, file,
+                                    compression, compresslevel)
+                    write = partial(write_result, zip_file, info, future)
+                pending.append((future, write))
+                # limit number of compressed files waiting for writer
+                while len(pending) > 2 * jobs or (len(pending) > 0 and (
+                        pending[0][0] is None or pending[0][0].done())):
+                    pending.popleft()[1]()
+            while len(pending) > 0:
+                pending.popleft()[1]()
+        os.replace(tmp_path, dst)
+    except BaseException as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)  # clean up
+        raise e
+
+
+def archive(src: str, dst: str, jobs: int = 1,
+            compression: int = zipfile.ZIP_STORED, compresslevel: int = None,
+            update: bool = False):
     """
     Zip src and save to dst
+    If jobs > 1, files are compressed by a pool of worker processes
+    and written to dst in the same order
+    If update is True, unchanged entries of existing dst are reused
     """
+    if not RAW_WRITE_SUPPORTED:
+        jobs, update = 1, False  # ZipFile internals differ
+    if update:
+        update_archive(src, dst, jobs, compression, compresslevel)
+        return
+
     src_dir = os.path.dirname(src) if os.path.isfile(src) else src
-    with ZipFile(dst, 'w') as zipfile:
-        for file in all_files(src):
-            if os.path.abspath(file) != os.path.abspath(dst):
-                zipfile.write(file, os.path.relpath(file, src_dir))
+    files = (file for file in all_files(src)
+             if os.path.abspath(file) != os.path.abspath(dst))
+    with ZipFile(dst, 'w', compression, compresslevel=compresslevel) \
+            as zip_file:
+        if jobs <= 1:
+            for file in files:
+                zip_file.write(file, os.path.relpath(file, src_dir))
+            return
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            pending = deque()
+            try:
+                for file in files:
+                    info = ZipInfo.from_file(file,
+                                             os.path.relpath(file, src_dir))
+                    info.compress_type = compression
+                    pending.append((info, executor.submit(
+                        compress_file, file, compression, compresslevel)))
+                    # limit number of compressed files waiting for writer
+                    while len(pending) > 2 * jobs or \
+                            (len(pending) > 0 and pending[0][1].done()):
+                        write_result(zip_file, *pending.popleft())
+                while len(pending) > 0:
+                    write_result(zip_file, *pending.popleft())
+            finally:
+                discard_results(future for _, future in pending)
 
 
 def main():
     """
     Main function for archiving
-    usage: python project2_task3_c.py src dst
+    usage: python project2_task3_c.py src dst [--jobs N]\
+    [--method {stored,deflate,bzip2,lzma}] [--level LEVEL] [--update]
     """
     parser = argparse.ArgumentParser(description='Archiver')
     parser.add_argument('src', type=str, help='path to source')
     parser.add_argument('dst', type=str, help='path to destination')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of parallel compressing processes')
+    parser.add_argument('--method', choices=list(METHODS), default='stored',
+                        help='Compression method')
+    parser.add_argument('--level', type=int, default=None,
+                        help='Compression level (0-9 for deflate, '
+                             '1-9 for bzip2)')
+    parser.add_argument('--update', action='store_true',
+                        help='Reuse unchanged entries of existing archive')
     args = parser.parse_args()
 
     try:
         if os.path.exists(args.src):
-            archive(args.src, args.dst)
+            archive(args.src, args.dst, args.jobs, METHODS[args.method],
+                    args.level, args.update)
         else:
             print("Cannot find any file or directory in specified source path")
     except PermissionError: